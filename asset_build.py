@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Batch runner shared by the portfolio asset generators
+Renders independent tasks serially or on a process pool, prints their
+progress in task order and collects per-task failures instead of aborting
+"""
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+import sys
+import traceback
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+import asset_encoder
+from font_registry import SANS_FACES, fonts
+
+# section: heading printed before the first task of a group
+# label: unique, stable name of the task (also seeds its random state)
+# method/args: generator method to call and its positional arguments
+# outputs: file names the task writes, relative to the output directory
+# inputs: any further JSON-able data the result depends on (palette, sizes)
+Task = namedtuple('Task', 'section label method args outputs inputs', defaults=((), None))
+TaskResult = namedtuple('TaskResult', 'task value output error encodings', defaults=((),))
+
+# The generator instance each worker process renders with
+_generator = None
+
+
+def _init_worker(generator):
+    global _generator
+    _generator = generator
+
+
+def task_seed(task):
+    return zlib.crc32(task.label.encode())
+
+
+def _run_task(task):
+    """Run one task on this process's generator, capturing its output
+
+    The global random state is reseeded from the task label so an asset
+    comes out the same whichever worker renders it and in whatever order.
+    """
+    seed = task_seed(task)
+    random.seed(seed)
+    np.random.seed(seed)
+    output = io.StringIO()
+    asset_encoder.records.clear()
+    try:
+        with contextlib.redirect_stdout(output):
+            value = getattr(_generator, task.method)(*task.args)
+        return TaskResult(task, value, output.getvalue(), None, tuple(asset_encoder.records))
+    except Exception:
+        return TaskResult(task, None, output.getvalue(), traceback.format_exc())
+
+
+def file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def code_version(generator):
+    """Hash of the source files and font that decide what the generator draws"""
+    digest = hashlib.sha256()
+    module = sys.modules[type(generator).__module__]
+    here = Path(__file__)
+    for path in (module.__file__, here.with_name('portfolio_graphics.py'),
+                 here.with_name('font_registry.py'), here.with_name('create_favicon.py'),
+                 here.with_name('asset_encoder.py'), here.with_name('card_scene.py'), here):
+        digest.update(Path(path).read_bytes())
+    digest.update(str(fonts.find(*SANS_FACES)).encode())
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """Content-addressed record of which task inputs produced which outputs
+
+    A task's input hash covers its method, arguments, extra inputs, random
+    seed and the generator code version. The task is skipped when the
+    previous build recorded the same input hash and every output still has
+    the recorded content hash.
+    """
+
+    def __init__(self, output_dir, previous=None, version=''):
+        self.output_dir = Path(output_dir)
+        self.previous = previous or {}
+        self.version = version
+        self.entries = {}
+
+    @classmethod
+    def load(cls, generator, output_dir, manifest_name='manifest.json'):
+        manifest_path = Path(output_dir) / manifest_name
+        previous = {}
+        try:
+            with open(manifest_path) as f:
+                previous = json.load(f).get('build', {})
+        except (OSError, ValueError):
+            pass
+        return cls(output_dir, previous, code_version(generator))
+
+    def input_hash(self, task):
+        key = {
+            'method': task.method,
+            'args': task.args,
+            'inputs': task.inputs,
+            'seed': task_seed(task),
+            'code': self.version,
+        }
+        encoded = json.dumps(key, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def output_hashes(self, task):
+        return {name: file_digest(self.output_dir / name) for name in task.outputs}
+
+    def is_fresh(self, task):
+        """True (and the entry carried over) if task's outputs are up to date"""
+        entry = self.previous.get(task.label)
+        if not task.outputs or not entry or entry.get('inputs') != self.input_hash(task):
+            return False
+        try:
+            if self.output_hashes(task) != entry.get('outputs'):
+                return False
+        except OSError:
+            return False
+        # Width variants and alternates aren't declared outputs; they just
+        # have to still exist
+        for info in entry.get('encoding', {}).values():
+            files = [info['file']] + ([info['alternate']['file']] if info.get('alternate') else [])
+            if not all((self.output_dir / name).exists() for name in files):
+                return False
+        self.entries[task.label] = entry
+        return True
+
+    def record(self, task, encodings=()):
+        try:
+            outputs = self.output_hashes(task)
+        except OSError:
+            return
+        self.entries[task.label] = {'inputs': self.input_hash(task), 'outputs': outputs}
+        if encodings:
+            self.entries[task.label]['encoding'] = {
+                record.name: asset_encoder.encoding_info(record) for record in encodings
+            }
+
+    def encodings(self):
+        """{file name: encoding_info} over every recorded task"""
+        files = {}
+        for entry in self.entries.values():
+            files.update(entry.get('encoding', {}))
+        return files
+
+    def encoding_summary(self):
+        """Chosen formats per asset plus total bytes saved against plain PNG
+
+        bytes counts the alternate where there is one, i.e. what a browser
+        that decodes it downloads.
+        """
+        files = self.encodings()
+        written = sum(asset_encoder.served_bytes(info) for info in files.values())
+        baseline = sum(info['png_bytes'] for info in files.values())
+        return {
+            'files': dict(sorted(files.items())),
+            'bytes': written,
+            'png_bytes': baseline,
+            'saved_bytes': baseline - written,
+        }
+
+
+def resolve_jobs(jobs):
+    """--jobs value to a worker count: 0 means one per CPU"""
+    return jobs if jobs > 0 else os.cpu_count() or 1
+
+
+def run_tasks(generator, tasks, jobs=1, cache=None):
+    """Render tasks with `jobs` processes; returns results in task order
+
+    Output of each task is printed as soon as it and every task before it
+    have finished, so the log reads the same as a serial run. A task that
+    raises is reported and the batch carries on. With a BuildCache, tasks
+    whose outputs are up to date are skipped and successful ones recorded.
+    """
+    jobs = resolve_jobs(jobs)
+    tasks = list(tasks)
+    fresh = {task.label for task in tasks if cache is not None and cache.is_fresh(task)}
+    stale = [task for task in tasks if task.label not in fresh]
+    executor = None
+    if jobs > 1 and len(stale) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(stale)),
+                                       initializer=_init_worker, initargs=(generator,))
+        rendered = executor.map(_run_task, stale)
+    else:
+        _init_worker(generator)
+        rendered = map(_run_task, stale)
+
+    collected = []
+    section = None
+    try:
+        for number, task in enumerate(tasks, 1):
+            if task.label in fresh:
+                result = TaskResult(task, None, f"⏭️  Up to date: {', '.join(task.outputs)}\n", None)
+            else:
+                result = next(rendered)
+                if cache is not None and not result.error:
+                    cache.record(task, result.encodings)
+            if task.section != section:
+                section = task.section
+                print(f"\n{section}")
+            print(result.output, end='')
+            if result.error:
+                print(f"❌ [{number}/{len(tasks)}] {task.label} failed:")
+                print("   " + result.error.rstrip().replace("\n", "\n   "))
+            collected.append(result)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return collected
+
+
+def report_failures(results):
+    """Print a summary of failed tasks; returns their labels"""
+    failed = [result.task.label for result in results if result.error]
+    if failed:
+        print(f"\n⚠️  {len(failed)} of {len(results)} tasks failed: {', '.join(failed)}")
+    return failed
+
+
+def add_build_arguments(parser):
+    """--jobs / --output-dir options shared by the generator CLIs"""
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="render with N processes (0 = one per CPU)")
+    parser.add_argument('--output-dir', help="write assets here instead of the default folder")
+    return parser
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Adaptive image encoding for generated assets
+Always writes the asset as the smaller of a palette and an optimized PNG,
+plus a lossless/lossy WebP or AVIF copy next to it when one of those is
+smaller still and stays visually identical; optionally writes downsampled
+width variants (and the @2x render of fixed-size assets) and describes
+them as srcset entries
+"""
+
+import io
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, features
+
+# Lowest PSNR (dB, premultiplied RGBA) a lossy candidate may have
+PSNR_THRESHOLD = 40.0
+FORMATS = ('png-palette', 'png', 'webp', 'webp-lossy', 'avif')
+EXTENSIONS = {'PNG': '.png', 'WEBP': '.webp', 'AVIF': '.avif'}
+MIME_TYPES = {'.png': 'image/png', '.webp': 'image/webp', '.avif': 'image/avif'}
+# Served to browsers that can't decode the alternate, and linked from index.html
+CANONICAL = '.png'
+# An alternate must be at least this much smaller than the PNG to be written
+ALTERNATE_MIN_SAVING = 0.1
+# Widths of the responsive variants; only those narrower than the render are made
+VARIANT_WIDTHS = (320, 640, 960, 1280)
+
+Candidate = namedtuple('Candidate', 'name format lossless options')
+# file/format/bytes/psnr describe the canonical PNG; alternate is an
+# Alternate for the smaller WebP/AVIF copy, or None. group: logical asset a
+# width variant belongs to (its own name for the full render); sizes: the
+# <img sizes> value, set on the full render only
+Encoded = namedtuple('Encoded', 'name file format bytes baseline_bytes psnr width height group sizes '
+                     'alternate', defaults=(None, None, None))
+Alternate = namedtuple('Alternate', 'file format bytes psnr')
+
+# Effort settings trade a few percent of size for encoding several times
+# faster: PNG level 9, lossless WebP at method 6 and AVIF at its default
+# speed took seconds per card, far longer than rendering it
+CANDIDATES = [
+    Candidate('png-palette', 'PNG', False, {'optimize': True}),
+    Candidate('png', 'PNG', True, {'compress_level': 6}),
+    Candidate('webp', 'WEBP', True, {'lossless': True, 'method': 2, 'quality': 50}),
+    Candidate('webp-lossy', 'WEBP', False, {'quality': 90, 'method': 4}),
+    Candidate('avif', 'AVIF', False, {'quality': 80, 'speed': 7}),
+]
+# Pillow's default PNG encoding: the fallback, and the baseline savings are
+# reported against
+PLAIN = CANDIDATES[1]
+
+# Encodings written by this process since the last reset, in order; the
+# batch runner collects them per task for the manifest
+records = []
+
+
+def available(candidate):
+    return candidate.format == 'PNG' or features.check(candidate.format.lower())
+
+
+def premultiplied(img):
+    """RGBA as float with colour scaled by alpha, so hidden pixels don't count"""
+    pixels = np.asarray(img.convert('RGBA'), dtype=np.float32)
+    pixels[..., :3] *= pixels[..., 3:] / 255.0
+    return pixels
+
+
+def psnr(reference, data):
+    """PSNR in dB of encoded bytes against the reference pixels"""
+    decoded = premultiplied(Image.open(io.BytesIO(data)))
+    mse = float(np.mean((reference - decoded) ** 2))
+    return float('inf') if mse == 0 else 10 * np.log10(255.0 ** 2 / mse)
+
+
+def encode_candidate(img, candidate):
+    source = img
+    if candidate.name == 'png-palette':
+        method = Image.Quantize.FASTOCTREE if img.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+        source = img.quantize(256, method=method)
+    elif img.mode not in ('RGB', 'RGBA'):
+        source = img.convert('RGBA')
+    buffer = io.BytesIO()
+    source.save(buffer, candidate.format, **candidate.options)
+    return buffer.getvalue()
+
+
+class Trial:
+    """Candidate encodings of one image, sharing the PSNR reference pixels"""
+
+    def __init__(self, img, threshold=PSNR_THRESHOLD):
+        self.img = img
+        self.threshold = threshold
+        self.reference = None
+        self.data = {}
+
+    def encoded(self, candidate):
+        if candidate.name not in self.data:
+            self.data[candidate.name] = encode_candidate(self.img, candidate)
+        return self.data[candidate.name]
+
+    def quality(self, candidate):
+        """PSNR of the candidate's encoding (inf for lossless ones)"""
+        if candidate.lossless:
+            return float('inf')
+        if self.reference is None:
+            self.reference = premultiplied(self.img)
+        return psnr(self.reference, self.encoded(candidate))
+
+    def best(self, candidates):
+        """(candidate, data, psnr) of the smallest one within the threshold, or None"""
+        best = None
+        for candidate in candidates:
+            data = self.encoded(candidate)
+            if best is not None and len(data) >= len(best[1]):
+                continue
+            quality = self.quality(candidate)
+            if quality >= self.threshold:
+                best = (candidate, data, quality)
+        return best
+
+
+def rounded_psnr(quality):
+    return round(quality, 1) if quality != float('inf') else None
+
+
+def encode(img, path, formats=FORMATS, threshold=PSNR_THRESHOLD, group=None, sizes=None,
+           alternate_format=None):
+    """Write img as a PNG plus any smaller WebP/AVIF; returns the Encoded record
+
+    The canonical PNG at path (suffix forced to .png) is always written, as
+    the smaller allowed PNG encoding, so existing links and browsers without
+    the newer codecs keep working. The smallest allowed WebP/AVIF candidate
+    is written next to it under its own extension only if it is at least
+    ALTERNATE_MIN_SAVING smaller. Lossy candidates must reach `threshold` dB
+    PSNR against the original. Alternates left over from a previous run in
+    another format are removed.
+
+    alternate_format names the candidate to write the alternate with
+    instead of searching; encode_responsive uses it so every width of an
+    asset comes in the same formats. It is still skipped when it misses
+    `threshold` or isn't smaller than the PNG.
+    """
+    path = Path(path).with_suffix(CANONICAL)
+    trial = Trial(img, threshold)
+    allowed = [candidate for candidate in CANDIDATES
+               if candidate.name in formats and available(candidate)]
+    # No PNG encoding allowed or none within the threshold: plain lossless PNG
+    candidate, data, quality = (trial.best([c for c in allowed if c.format == 'PNG'])
+                                or trial.best([PLAIN]))
+    path.write_bytes(data)
+
+    alternate = None
+    if alternate_format is not None:
+        forced = next(c for c in CANDIDATES if c.name == alternate_format)
+        best = (forced, trial.encoded(forced), trial.quality(forced))
+        if best[2] < threshold or len(best[1]) >= len(data):
+            best = None
+    else:
+        best = trial.best([c for c in allowed if c.format != 'PNG'])
+        if best is not None and len(best[1]) > len(data) * (1 - ALTERNATE_MIN_SAVING):
+            best = None
+    if best is not None:
+        alt_candidate, alt_data, alt_quality = best
+        alt_path = path.with_suffix(EXTENSIONS[alt_candidate.format])
+        alt_path.write_bytes(alt_data)
+        alternate = Alternate(alt_path.name, alt_candidate.name, len(alt_data),
+                              rounded_psnr(alt_quality))
+    for extension in set(EXTENSIONS.values()) - {CANONICAL}:
+        if alternate is None or extension != Path(alternate.file).suffix:
+            path.with_suffix(extension).unlink(missing_ok=True)
+
+    record = Encoded(path.name, path.name, candidate.name, len(data), len(trial.encoded(PLAIN)),
+                     rounded_psnr(quality), img.width, img.height, group or path.name, sizes,
+                     alternate)
+    records.append(record)
+    return record
+
+
+def downsample(img, width):
+    height = round(img.height * width / img.width)
+    return img.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+
+
+def encode_responsive(img, path, sizes='100vw', widths=VARIANT_WIDTHS, formats=FORMATS, scale=1):
+    """Encode img plus width variants downsampled from the same render
+
+    The full-size image keeps path's name; each variant narrower than it
+    is written as <stem>-<width>w. With scale > 1, img was rendered at that
+    (whole) multiple of the asset's size: it is written as <stem>@<scale>x
+    and path's name gets the 1x image downsampled from it.
+
+    The formats are chosen once, on the 1x image: other widths get the same
+    alternate, so a srcset never mixes formats. If any width's alternate
+    misses the PSNR threshold or isn't smaller than its PNG, the rest are
+    written without one, and srcset_manifest leaves the <source> out for
+    the whole asset. Returns the record of the 1x image.
+    """
+    path = Path(path)
+    full_width = img.width // scale
+    # Box-filtering whole pixels averages the supersampled render exactly
+    record = encode(img.reduce(scale) if scale > 1 else img, path, formats, sizes=sizes)
+    alternate_format = record.alternate.format if record.alternate else None
+    png_formats = tuple(c.name for c in CANDIDATES if c.format == 'PNG' and c.name in formats)
+    variants = [(path.with_name(f"{path.stem}-{width}w{path.suffix}"), downsample(img, width))
+                for width in widths if width < full_width]
+    if scale > 1:
+        variants.append((path.with_name(f"{path.stem}@{scale}x{path.suffix}"), img))
+    for variant_path, variant in variants:
+        encoded = encode(variant, variant_path, png_formats, group=path.name,
+                         alternate_format=alternate_format)
+        if encoded.alternate is None:
+            alternate_format = None
+    return record
+
+
+def encoding_info(record):
+    """JSON-able manifest entry for an Encoded record"""
+    return {
+        'file': record.file,
+        'format': record.format,
+        'bytes': record.bytes,
+        'png_bytes': record.baseline_bytes,
+        'psnr': record.psnr,
+        'width': record.width,
+        'height': record.height,
+        'group': record.group,
+        'sizes': record.sizes,
+        'alternate': record.alternate._asdict() if record.alternate else None,
+    }
+
+
+def served_bytes(info):
+    """Bytes a browser that decodes the alternate downloads, from encoding_info"""
+    alternate = info.get('alternate')
+    return alternate['bytes'] if alternate else info['bytes']
+
+
+def srcset_manifest(files):
+    """Logical asset -> src/srcset/sizes/sources, from {name: encoding_info} entries
+
+    src and srcset list the PNGs; sources holds one {type, srcset} per
+    alternate format present at every width, for <picture> <source>
+    elements ahead of the <img>. Only assets written with
+    encode_responsive (which sets sizes) appear.
+    """
+    groups = {}
+    for name, info in files.items():
+        groups.setdefault(info.get('group', name), []).append(info)
+    manifest = {}
+    for name, members in sorted(groups.items()):
+        full = files.get(name)
+        if full is None or not full.get('sizes'):
+            continue
+        members.sort(key=lambda info: info['width'])
+        alternates = [info.get('alternate') for info in members]
+        sources = []
+        if all(alternates) and len({Path(alt['file']).suffix for alt in alternates}) == 1:
+            sources.append({
+                'type': MIME_TYPES[Path(alternates[0]['file']).suffix],
+                'srcset': ", ".join(f"{alt['file']} {info['width']}w"
+                                    for alt, info in zip(alternates, members)),
+            })
+        manifest[name] = {
+            'src': full['file'],
+            'width': full['width'],
+            'height': full['height'],
+            'srcset': ", ".join(f"{info['file']} {info['width']}w" for info in members),
+            'sizes': full['sizes'],
+            'sources': sources,
+        }
+    return manifest
+
+
+def describe(record):
+    text = f"{record.format}, {record.bytes:,} bytes"
+    smallest = record.bytes
+    if record.alternate:
+        text += f"; {record.alternate.format}, {record.alternate.bytes:,} bytes"
+        smallest = record.alternate.bytes
+    saved = record.baseline_bytes - smallest
+    return f"{text} ({saved / record.baseline_bytes:.0%} smaller than plain PNG)"
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Benchmark the vectorized drawing primitives against the per-row/per-item
+PIL loops they replaced in the asset generators
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+import card_scene
+import portfolio_graphics
+from layer_cache import LayerCache
+
+RESOLUTIONS = [(200, 200), (800, 600), (1200, 675), (1920, 1080), (3840, 2160)]
+REPEAT = 3
+
+
+def best_of(fn, repeat=REPEAT):
+    """Fastest wall time of `repeat` calls, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def legacy_gradient(width, height, c1, c2):
+    """The one-draw.line-per-row loop create_gradient_image used to run"""
+    img = Image.new('RGB', (width, height))
+    draw = ImageDraw.Draw(img)
+    for y in range(height):
+        ratio = y / height
+        fill = tuple(int(a * (1 - ratio) + b * ratio) for a, b in zip(c1, c2))
+        draw.line([(0, y), (width, y)], fill=fill)
+    return img
+
+
+def bench_gradient(repeat):
+    start, end = (102, 126, 234), (118, 75, 162)
+    rows = []
+    for width, height in RESOLUTIONS:
+        legacy = best_of(lambda: legacy_gradient(width, height, start, end), repeat)
+        vertical = best_of(
+            lambda: portfolio_graphics.linear_gradient((width, height), [start, end]), repeat)
+        angled = best_of(
+            lambda: portfolio_graphics.linear_gradient((width, height), [start, end], 135), repeat)
+        radial = best_of(
+            lambda: portfolio_graphics.radial_gradient((width, height), [start, end]), repeat)
+        rows.append({
+            'resolution': f"{width}x{height}",
+            'legacy_ms': round(legacy * 1000, 2),
+            'linear_ms': round(vertical * 1000, 2),
+            'linear_135_ms': round(angled * 1000, 2),
+            'radial_ms': round(radial * 1000, 2),
+            'speedup': round(legacy / vertical, 1),
+        })
+    return rows
+
+
+def legacy_circuit(img, cell=50):
+    """The per-cell np.random + ellipse/line loop create_project_card used to run"""
+    width, height = img.size
+    draw = ImageDraw.Draw(img, 'RGBA')
+    for i in range(0, width, cell):
+        for j in range(0, height, cell):
+            if np.random.random() > 0.7:
+                draw.ellipse([i - 2, j - 2, i + 2, j + 2], fill=(255, 255, 255, 30))
+                if np.random.random() > 0.5 and i < width - cell:
+                    draw.line([(i, j), (i + cell, j)], fill=(255, 255, 255, 20), width=1)
+                if np.random.random() > 0.5 and j < height - cell:
+                    draw.line([(i, j), (i, j + cell)], fill=(255, 255, 255, 20), width=1)
+    return img
+
+
+def bench_circuit(repeat):
+    rows = []
+    for width, height in RESOLUTIONS:
+        base = Image.new('RGB', (width, height), (26, 26, 46))
+
+        def overlay(**kwargs):
+            return portfolio_graphics.draw_circuit(base.copy(), **kwargs)
+
+        legacy = best_of(lambda: legacy_circuit(base.copy()), repeat)
+        batched = best_of(lambda: overlay(seed=1, tiled=False), repeat)
+        portfolio_graphics.circuit_tile.cache_clear()
+        tiled = best_of(lambda: overlay(seed=1), repeat)
+        rows.append({
+            'resolution': f"{width}x{height}",
+            'legacy_ms': round(legacy * 1000, 2),
+            'batched_ms': round(batched * 1000, 2),
+            'tiled_ms': round(tiled * 1000, 2),
+            'speedup': round(legacy / tiled, 1),
+        })
+    return rows
+
+
+NETWORK_SIZES = [30, 100, 1000, 3000, 10000]
+NETWORK_DEGREE = 8       # expected neighbours per node, kept constant across n
+LEGACY_MAX_NODES = 1000  # the all-pairs loop takes minutes beyond this
+
+
+def legacy_edges(nodes, radius):
+    """The all-pairs loop create_hero_background used to run"""
+    edges = []
+    for i, node1 in enumerate(nodes):
+        for j, node2 in enumerate(nodes[i + 1:], i + 1):
+            dist = np.sqrt((node1[0] - node2[0]) ** 2 + (node1[1] - node2[1]) ** 2)
+            if dist < radius:
+                edges.append((i, j, dist))
+    return edges
+
+
+def bench_network(repeat):
+    width, height = RESOLUTIONS[-1]
+    rows = []
+    for count in NETWORK_SIZES:
+        radius = (width * height * NETWORK_DEGREE / (math.pi * count)) ** 0.5
+        points = portfolio_graphics.scatter_nodes((width, height), count, margin=100, seed=1)
+        place = best_of(lambda: portfolio_graphics.scatter_nodes(
+            (width, height), count, margin=100, seed=1), repeat)
+        grid = best_of(lambda: portfolio_graphics.neighbor_pairs(points, radius), repeat)
+        edges = len(portfolio_graphics.neighbor_pairs(points, radius)[0])
+        legacy = None
+        if count <= LEGACY_MAX_NODES:
+            legacy = best_of(lambda: legacy_edges(points.tolist(), radius), 1)
+        rows.append({
+            'nodes': count,
+            'radius': round(radius, 1),
+            'edges': edges,
+            'poisson_ms': round(place * 1000, 2),
+            'legacy_edges_ms': round(legacy * 1000, 2) if legacy is not None else '-',
+            'grid_edges_ms': round(grid * 1000, 2),
+            'speedup': round(legacy / grid, 1) if legacy is not None else '-',
+        })
+    return rows
+
+
+ICON_SIZES = [200, 500, 1024, 2048]
+
+
+def legacy_icon(size, color):
+    """The concentric-ellipse loop create_skill_icons used to run"""
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    half = size // 2
+    for i in range(half, 0, -1):
+        draw.ellipse([half - i, half - i, half + i, half + i],
+                     fill=(*color, int(255 * (i / half))))
+    return img
+
+
+def bench_radial_disc(repeat):
+    color = (124, 58, 237)
+    rows = []
+    for size in ICON_SIZES:
+        legacy = best_of(lambda: legacy_icon(size, color), repeat)
+        field = best_of(lambda: portfolio_graphics.radial_disc(
+            (size, size), [(*color, 0), (*color, 255)]), repeat)
+        rows.append({
+            'size': size,
+            'legacy_ms': round(legacy * 1000, 2),
+            'distance_field_ms': round(field * 1000, 2),
+            'speedup': round(legacy / field, 1),
+        })
+    return rows
+
+
+def legacy_grain(img):
+    """The per-point noise loop create_gradient_background used to run
+
+    (its blurred noise was then thrown away in favour of a full-size white blend)
+    """
+    width, height = img.size
+    noise = Image.new('L', (width, height))
+    noise_draw = ImageDraw.Draw(noise)
+    for _ in range(5000):
+        x = np.random.randint(0, width)
+        y = np.random.randint(0, height)
+        brightness = np.random.randint(200, 255)
+        noise_draw.point((x, y), fill=brightness)
+    noise = noise.filter(ImageFilter.GaussianBlur(radius=1))
+    return Image.blend(img, Image.new('RGB', (width, height), (255, 255, 255)), 0.05)
+
+
+def bench_grain(repeat):
+    rows = []
+    for width, height in RESOLUTIONS:
+        base = portfolio_graphics.linear_gradient((width, height), [(91, 95, 255), (118, 75, 162)])
+        legacy = best_of(lambda: legacy_grain(base), repeat)
+        portfolio_graphics.grain_tile.cache_clear()
+        cold = best_of(lambda: portfolio_graphics.apply_grain(base.copy(), lift=0.05), 1)
+        cached = best_of(lambda: portfolio_graphics.apply_grain(base.copy(), lift=0.05), repeat)
+        rows.append({
+            'resolution': f"{width}x{height}",
+            'legacy_ms': round(legacy * 1000, 2),
+            'first_tile_ms': round(cold * 1000, 2),
+            'cached_tile_ms': round(cached * 1000, 2),
+            'speedup': round(legacy / cached, 1),
+        })
+    return rows
+
+
+def legacy_glass(img):
+    """The full-canvas overlay + blur the premium cards used for their glass panel"""
+    width, height = img.size
+    overlay = Image.new('RGBA', (width, height), (255, 255, 255, 0))
+    ImageDraw.Draw(overlay).rounded_rectangle(
+        [50, 50, width - 50, height - 50], radius=30,
+        fill=(255, 255, 255, 30), outline=(255, 255, 255, 60), width=2)
+    overlay = overlay.filter(ImageFilter.GaussianBlur(radius=2))
+    return Image.alpha_composite(img, overlay)
+
+
+def bench_glass(repeat):
+    rows = []
+    for width, height in RESOLUTIONS:
+        base = Image.new('RGBA', (width, height), (91, 95, 255, 255))
+
+        def glass():
+            return portfolio_graphics.composite_blurred_shape(
+                base.copy(), 'rounded_rectangle', [50, 50, width - 50, height - 50], blur=2,
+                radius=30, fill=(255, 255, 255, 30), outline=(255, 255, 255, 60), width=2)
+
+        legacy = best_of(lambda: legacy_glass(base), repeat)
+        portfolio_graphics.blurred_shape.cache_clear()
+        cold = best_of(glass, 1)
+        cached = best_of(glass, repeat)
+        rows.append({
+            'resolution': f"{width}x{height}",
+            'legacy_ms': round(legacy * 1000, 2),
+            'first_sprite_ms': round(cold * 1000, 2),
+            'cached_sprite_ms': round(cached * 1000, 2),
+            'speedup': round(legacy / cached, 1),
+        })
+    return rows
+
+
+GLOW_NODES = [17, 100, 1000, 10000]
+GLOW_RADIUS = 15
+
+
+def legacy_glow(img, nodes, color):
+    """The ring-per-radius ellipse loop draw_neural_network used for each node"""
+    draw = ImageDraw.Draw(img, 'RGBA')
+    for x, y in nodes:
+        for radius in range(GLOW_RADIUS, 0, -1):
+            opacity = int(255 * (radius / GLOW_RADIUS) * 0.3)
+            draw.ellipse([x - radius, y - radius, x + radius, y + radius], fill=(*color, opacity))
+    return img
+
+
+def bench_glow(repeat):
+    width, height = RESOLUTIONS[-1]
+    color = (0, 217, 255)
+    base = Image.new('RGBA', (width, height), (26, 26, 46, 255))
+    rows = []
+    for count in GLOW_NODES:
+        nodes = portfolio_graphics.scatter_nodes((width, height), count, margin=20, seed=1).tolist()
+        legacy = best_of(lambda: legacy_glow(base.copy(), nodes, color), repeat)
+        curve = portfolio_graphics.glow_curve(GLOW_RADIUS)
+        stamped = best_of(lambda: portfolio_graphics.stamp_sprites(
+            base.copy(), portfolio_graphics.glow_stamp(color, curve), nodes), repeat)
+        rows.append({
+            'nodes': count,
+            'legacy_ms': round(legacy * 1000, 2),
+            'stamped_ms': round(stamped * 1000, 2),
+            'speedup': round(legacy / stamped, 1),
+        })
+    return rows
+
+
+SCENE_COUNTS = [5, 20, 100]
+SCENE_SCHEMES = [((91, 95, 255), (118, 75, 162)), ((139, 92, 246), (102, 126, 234)),
+                 ((16, 185, 129), (59, 130, 246)), ((79, 70, 229), (147, 51, 234))]
+SCENE_THEMES = list(card_scene.THEMES)
+
+
+def benchmark_scenes(count):
+    """count premium card scenes over four colour schemes and the five themes"""
+    scenes = []
+    for i in range(count):
+        start, end = SCENE_SCHEMES[i % len(SCENE_SCHEMES)]
+        context = {
+            'scheme_start': start, 'scheme_end': end, 'visual_theme': SCENE_THEMES[i % len(SCENE_THEMES)],
+            'accent': (0, 217, 255), 'primary_blue': (91, 95, 255), 'success': (16, 185, 129),
+            'light': (247, 247, 255), 'title': f"PROJECT {i}", 'subtitle': "Benchmark scene",
+            'description': "Declarative card layout", 'stats': ['Python', 'NumPy', 'Pillow'],
+        }
+        scenes.append(card_scene.build_scene('premium', f"card_{i}", context))
+    return scenes
+
+
+def bench_scenes(repeat):
+    rows = []
+    for count in SCENE_COUNTS:
+        scenes = benchmark_scenes(count)
+        separate = best_of(lambda: [card_scene.render_scene(scene, cache=None) for scene in scenes],
+                           repeat)
+        batched = best_of(lambda: card_scene.render_scenes(scenes, cache=None), repeat)
+        cache = LayerCache()
+        card_scene.render_scenes(scenes, cache)
+        warm = best_of(lambda: card_scene.render_scenes(scenes, cache), repeat)
+        stats = card_scene.batch_stats(scenes)
+        rows.append({
+            'scenes': count,
+            'layers': stats['layers'],
+            'unique_layers': stats['unique_layers'],
+            'separate_ms': round(separate * 1000, 2),
+            'batched_ms': round(batched * 1000, 2),
+            'warm_cache_ms': round(warm * 1000, 2),
+            'speedup': round(separate / warm, 1),
+        })
+    return rows
+
+
+SUITES = {
+    'gradient': bench_gradient,
+    'circuit': bench_circuit,
+    'network': bench_network,
+    'radial_disc': bench_radial_disc,
+    'grain': bench_grain,
+    'glass': bench_glass,
+    'glow': bench_glow,
+    'scenes': bench_scenes,
+}
+
+
+def print_table(name, rows):
+    print(f"\n📊 {name}")
+    columns = list(rows[0])
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("   " + "  ".join(column.rjust(w) for column, w in zip(columns, widths)))
+    for row in rows:
+        print("   " + "  ".join(str(row[column]).rjust(w) for column, w in zip(columns, widths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark portfolio_graphics primitives")
+    parser.add_argument('suites', nargs='*', choices=[[], *SUITES], default=[],
+                        help="suites to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=REPEAT,
+                        help="runs per measurement; the fastest is reported")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.suites or SUITES:
+        results[name] = SUITES[name](args.repeat)
+        if not args.json:
+            print_table(name, results[name])
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
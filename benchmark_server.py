@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Load-test serve.py with a realistic page-load mix
+Starts the server on an ephemeral port, sweeps client concurrency and
+reports throughput, tail latency and errors as JSON
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from html.parser import HTMLParser
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+LEVELS = [1, 4, 16, 64]
+DURATION = 5.0
+TOLERANCE = 0.15
+BASELINE = ROOT / "benchmark_baseline.json"
+
+
+class AssetParser(HTMLParser):
+    """Collect same-origin stylesheet, script, icon and image references"""
+
+    def __init__(self):
+        super().__init__()
+        self.assets = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        url = None
+        if tag == 'link' and attrs.get('rel') in ('stylesheet', 'icon', 'preload'):
+            url = attrs.get('href')
+        elif tag in ('script', 'img'):
+            url = attrs.get('src')
+        if url and not re.match(r'^([a-z]+:)?//', url) and not url.startswith('data:'):
+            self.assets.append('/' + url.lstrip('/'))
+
+
+def page_load_mix(page='index.html'):
+    """The requests a browser makes for page: the document, then its assets
+
+    References to files that don't exist in this checkout are skipped so a
+    missing generated asset doesn't show up as a server error.
+    """
+    parser = AssetParser()
+    parser.feed((ROOT / page).read_text(encoding='utf-8'))
+    mix = ['/' + page]
+    for url in parser.assets:
+        if (ROOT / url.lstrip('/')).is_file():
+            mix.append(url)
+        else:
+            print(f"⚠️  Skipping missing asset {url}", file=sys.stderr)
+    return mix
+
+
+def start_server(server_args):
+    """Launch serve.py on an ephemeral port; returns (process, port)"""
+    command = [sys.executable, '-u', str(ROOT / 'serve.py'), '--port', '0',
+               '--no-browser', '--no-access-log', *server_args]
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                            text=True)
+    for line in proc.stdout:
+        match = re.search(r'http://localhost:(\d+)', line)
+        if match:
+            # Keep draining stdout so the server never blocks on a full pipe
+            threading.Thread(target=proc.stdout.read, daemon=True).start()
+            return proc, int(match.group(1))
+    proc.wait()
+    raise RuntimeError(f"serve.py exited with status {proc.returncode} before listening")
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run_level(port, mix, concurrency, duration):
+    """Replay the mix from `concurrency` clients for `duration` seconds"""
+    latencies = []
+    errors = []
+    transferred = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client():
+        local_latencies, local_errors, local_bytes = [], 0, 0
+        while time.perf_counter() < deadline:
+            for url in mix:
+                started = time.perf_counter()
+                try:
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                    conn.request('GET', url)
+                    response = conn.getresponse()
+                    body = response.read()
+                    conn.close()
+                    if response.status >= 400:
+                        local_errors += 1
+                        continue
+                except (OSError, http.client.HTTPException):
+                    local_errors += 1
+                    continue
+                local_latencies.append(time.perf_counter() - started)
+                local_bytes += len(body)
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+            transferred[0] += local_bytes
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'duration_s': round(elapsed, 3),
+        'requests_per_s': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'bytes': transferred[0],
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return human-readable regressions of results against baseline"""
+    previous = {level['concurrency']: level for level in baseline['levels']}
+    regressions = []
+    for level in results['levels']:
+        base = previous.get(level['concurrency'])
+        if base is None:
+            continue
+        c = level['concurrency']
+        if level['requests_per_s'] < base['requests_per_s'] * (1 - tolerance):
+            regressions.append(f"c={c}: {level['requests_per_s']} req/s "
+                               f"vs baseline {base['requests_per_s']}")
+        if level['p99_ms'] > base['p99_ms'] * (1 + tolerance):
+            regressions.append(f"c={c}: p99 {level['p99_ms']} ms vs baseline {base['p99_ms']}")
+        if level['errors'] > base['errors']:
+            regressions.append(f"c={c}: {level['errors']} errors vs baseline {base['errors']}")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark serve.py")
+    parser.add_argument('--levels', default=','.join(map(str, LEVELS)),
+                        help="comma-separated client concurrency levels")
+    parser.add_argument('--duration', type=float, default=DURATION,
+                        help="seconds to run each level")
+    parser.add_argument('--page', default='index.html',
+                        help="page whose subresources make up the request mix")
+    parser.add_argument('--server-args', default='',
+                        help="extra serve.py arguments, e.g. \"--backend asyncio --workers 16\"")
+    parser.add_argument('--output', help="also write the JSON report to this file")
+    parser.add_argument('--baseline', default=str(BASELINE),
+                        help="baseline report to compare against (skipped if missing)")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help="allowed fractional drop in req/s or rise in p99")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="store this run as the new baseline instead of comparing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    levels = [int(level) for level in args.levels.split(',')]
+    mix = page_load_mix(args.page)
+    server_args = shlex.split(args.server_args)
+
+    print(f"🏁 Benchmarking {len(mix)} requests per page load: {' '.join(mix)}",
+          file=sys.stderr)
+    proc, port = start_server(server_args)
+    try:
+        results = {
+            'page': args.page,
+            'mix': mix,
+            'server_args': server_args,
+            'cpu_count': os.cpu_count(),
+            'levels': [],
+        }
+        for concurrency in levels:
+            level = run_level(port, mix, concurrency, args.duration)
+            results['levels'].append(level)
+            print(f"   c={concurrency:<4} {level['requests_per_s']:>9} req/s  "
+                  f"p50 {level['p50_ms']:>8} ms  p99 {level['p99_ms']:>8} ms  "
+                  f"errors {level['errors']}", file=sys.stderr)
+    finally:
+        stop_server(proc)
+
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        Path(args.output).write_text(report + "\n")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(report + "\n")
+        print(f"💾 Saved baseline to {baseline_path}", file=sys.stderr)
+        return 0
+    if not baseline_path.exists():
+        print(f"ℹ️  No baseline at {baseline_path}; run with --save-baseline to create one",
+              file=sys.stderr)
+        return 0
+
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    if regressions:
+        print("❌ Regressions against baseline:", file=sys.stderr)
+        for regression in regressions:
+            print(f"   {regression}", file=sys.stderr)
+        return 1
+    print("✅ Within tolerance of baseline", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
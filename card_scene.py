@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Declarative project card scenes and a batched render engine
+A scene is a JSON-able description of one card: size, colour mode and an
+ordered stack of layers (gradient, grain, glass panel, circuit, visual
+theme, text, badges). Layouts in card_scenes.json are filled in per
+project, and a batch of scenes is planned so every distinct layer stack
+is rendered once, before the stacks built on top of it
+"""
+
+import functools
+import hashlib
+import itertools
+import json
+import math
+import re
+import zlib
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from PIL import ImageDraw
+
+from font_registry import get_font
+from layer_cache import layers as layer_cache
+from portfolio_graphics import (apply_grain, composite_blurred_shape, draw_circuit, glow_curve,
+                                glow_stamp, linear_gradient, node_stamp, stamp_sprites, to_rgb)
+
+SCENE_FILE = Path(__file__).with_name('card_scenes.json')
+# Stacks made only of these layers are what cards share (background, grain,
+# glass panel); they are also kept in the layer cache across batches
+CACHED_LAYERS = ('gradient', 'grain', 'glass_panel')
+PLACEHOLDER = re.compile(r'\{(\w+)\}')
+
+# key: hash of the layer stack up to and including this layer
+# parent: key of the stack below it (None for a scene's first layer)
+# scene: a scene the stack belongs to (for its size); outputs: names of the
+# scenes whose whole stack this is; cached: stack is all CACHED_LAYERS
+Step = namedtuple('Step', 'key parent layer scene outputs cached')
+
+
+@functools.lru_cache(maxsize=4)
+def _read_layouts(path):
+    with open(path) as f:
+        return json.load(f)['layouts']
+
+
+def load_layouts(path=SCENE_FILE):
+    """Layout name -> layout from the scene file (read once per path)"""
+    return _read_layouts(str(path))
+
+
+def resolve(value, context):
+    """Fill {name} placeholders from context throughout a layout value
+
+    A string that is exactly one placeholder takes the context value as is,
+    so lists and colours pass through; placeholders inside longer strings
+    are formatted in.
+    """
+    if isinstance(value, str):
+        match = PLACEHOLDER.fullmatch(value)
+        if match:
+            return context[match.group(1)]
+        return PLACEHOLDER.sub(lambda m: str(context[m.group(1)]), value)
+    if isinstance(value, list):
+        return [resolve(item, context) for item in value]
+    if isinstance(value, dict):
+        return {key: resolve(item, context) for key, item in value.items()}
+    return value
+
+
+def build_scene(layout, name, context, path=SCENE_FILE, size=None, leading=None):
+    """Scene `name` from the named layout, filled in with context
+
+    The result is plain JSON data (tuples become lists), so equal scenes
+    compare and hash equal however their context was built. size overrides
+    the layout's; leading, a tuple of layer types, keeps only the layers
+    of those types the layout starts with (e.g. a card's background), and
+    context only needs what they use.
+    """
+    spec = load_layouts(path)[layout]
+    layers = spec['layers']
+    if leading is not None:
+        layers = list(itertools.takewhile(lambda layer: layer['type'] in leading, layers))
+    scene = {
+        'name': name,
+        'layout': layout,
+        'size': list(size or spec['size']),
+        'mode': spec.get('mode', 'RGB'),
+        'layers': resolve(layers, context),
+    }
+    return json.loads(json.dumps(scene))
+
+
+def color(value):
+    return tuple(to_rgb(value))
+
+
+def options(layer, *exclude):
+    """Layer parameters other than its type, id and the names given"""
+    return {key: value for key, value in layer.items()
+            if key not in ('type', 'id', 'name') + exclude}
+
+
+# Visual themes: the illustration drawn on the right of a card
+
+def neural_network(img, box, color, layer_sizes=(4, 6, 6, 3), glow_radius=15):
+    """Layered network in box [x, y, width, height], nodes glowing"""
+    x_start, y_start, width, height = box
+    layer_spacing = width // (len(layer_sizes) + 1)
+    nodes = []
+    for layer_idx, num_nodes in enumerate(layer_sizes):
+        x = x_start + layer_spacing * (layer_idx + 1)
+        node_spacing = height // (num_nodes + 1)
+        nodes.append([(x, y_start + node_spacing * (node_idx + 1)) for node_idx in range(num_nodes)])
+
+    # Nodes with glow effect: fading rings rendered once as a stamp
+    glow = glow_stamp(color, glow_curve(glow_radius))
+    stamp_sprites(img, glow, [node for layer_nodes in nodes for node in layer_nodes])
+
+    draw = ImageDraw.Draw(img, 'RGBA')
+    for left, right in zip(nodes, nodes[1:]):
+        for node1 in left:
+            for node2 in right:
+                draw.line([node1, node2], fill=(*color, 100), width=1)
+    return img
+
+
+def network_hub(img, center, radius, color, num_nodes=8):
+    """Hub with orbiting nodes linked to it and to each other"""
+    center_x, center_y = center
+    draw = ImageDraw.Draw(img, 'RGBA')
+    stamp_sprites(img, node_stamp(30, color, (255, 255, 255), 3), [(center_x, center_y)])
+
+    node = node_stamp(15, color, (255, 255, 255), 2)
+    for i in range(num_nodes):
+        angle = (2 * math.pi * i) / num_nodes
+        x = center_x + radius * math.cos(angle)
+        y = center_y + radius * math.sin(angle)
+        stamp_sprites(img, node, [(x, y)])
+
+        # Connection to hub, then to the next node round
+        draw.line([(center_x, center_y), (x, y)], fill=(*color, 150), width=2)
+        next_angle = (2 * math.pi * ((i + 1) % num_nodes)) / num_nodes
+        next_x = center_x + radius * math.cos(next_angle)
+        next_y = center_y + radius * math.sin(next_angle)
+        draw.line([(x, y), (next_x, next_y)], fill=(*color, 100), width=1)
+    return img
+
+
+def security_matrix(img, center, size, color):
+    """Shield with a check mark"""
+    x, y = center
+    points = [
+        (x, y - size),  # Top center
+        (x + size * 0.8, y - size * 0.8),  # Top right
+        (x + size * 0.9, y - size * 0.3),  # Right upper
+        (x + size * 0.9, y + size * 0.3),  # Right lower
+        (x, y + size),  # Bottom center
+        (x - size * 0.9, y + size * 0.3),  # Left lower
+        (x - size * 0.9, y - size * 0.3),  # Left upper
+        (x - size * 0.8, y - size * 0.8),  # Top left
+    ]
+    draw = ImageDraw.Draw(img, 'RGBA')
+    draw.polygon(points, fill=color, outline=(255, 255, 255), width=3)
+    check_points = [
+        (x - size * 0.3, y),
+        (x - size * 0.1, y + size * 0.3),
+        (x + size * 0.4, y - size * 0.3)
+    ]
+    draw.line(check_points, fill=(255, 255, 255), width=4, joint='curve')
+    return img
+
+
+def document_flow(img, box, color, count=5):
+    """Pages drifting along a sine path, fading as they go"""
+    x_start, y_start, width, height = box
+    page_w, page_h = width / (count + 1), height * 0.6
+    step = (width - page_w) / max(count - 1, 1)
+    draw = ImageDraw.Draw(img, 'RGBA')
+    for i in range(count):
+        x = x_start + i * step
+        y = y_start + (height - page_h) / 2 + math.sin(i) * (height - page_h) / 2
+        alpha = round(255 * (0.8 - i * 0.1))
+        draw.rounded_rectangle([x, y, x + page_w, y + page_h], radius=page_w / 10,
+                               fill=(*color, alpha // 3), outline=(*color, alpha), width=2)
+        for line in range(1, 5):
+            line_y = y + line * page_h / 6
+            draw.line([(x + page_w * 0.15, line_y), (x + page_w * 0.85, line_y)],
+                      fill=(*color, alpha // 2), width=2)
+    return img
+
+
+def sound_waves(img, box, color, points=50, cycles=4):
+    """Sine waveform across box, with a fainter echo"""
+    x_start, y_start, width, height = box
+    draw = ImageDraw.Draw(img, 'RGBA')
+    middle = y_start + height / 2
+    for amplitude, alpha, line_width in ((height / 2, 255, 3), (height / 4, 120, 2)):
+        wave = [(x_start + width * i / (points - 1),
+                 middle + math.sin(2 * math.pi * cycles * i / (points - 1)) * amplitude)
+                for i in range(points)]
+        draw.line(wave, fill=(*color, alpha), width=line_width, joint='curve')
+    return img
+
+
+THEMES = {
+    'neural_network': neural_network,
+    'network_hub': network_hub,
+    'security_matrix': security_matrix,
+    'document_flow': document_flow,
+    'sound_waves': sound_waves,
+}
+
+
+# Layer renderers: (image below or None, layer, scene) -> image. Cards are
+# drawn on an opaque RGB canvas, where ImageDraw blends translucent fills
+# (on RGBA it overwrites them); the scene's mode is applied at the end
+
+RENDERERS = {}
+
+
+def renderer(kind):
+    def register(fn):
+        RENDERERS[kind] = fn
+        return fn
+    return register
+
+
+@renderer('gradient')
+def render_gradient(img, layer, scene):
+    return linear_gradient(tuple(scene['size']), [color(stop) for stop in layer['stops']],
+                           angle=layer.get('angle', 180))
+
+
+@renderer('grain')
+def render_grain(img, layer, scene):
+    return apply_grain(img, **options(layer))
+
+
+@renderer('glass_panel')
+def render_glass_panel(img, layer, scene):
+    return composite_blurred_shape(
+        img, layer.get('shape', 'rounded_rectangle'), layer['box'], layer.get('blur', 2),
+        fill=color(layer['fill']) if 'fill' in layer else None,
+        outline=color(layer['outline']) if 'outline' in layer else None,
+        width=layer.get('width', 1), radius=layer.get('radius', 0))
+
+
+@renderer('circuit')
+def render_circuit(img, layer, scene):
+    params = options(layer, 'seed')
+    if 'color' in params:
+        params['color'] = color(params['color'])
+    return draw_circuit(img, seed=zlib.crc32(str(layer['seed']).encode()), **params)
+
+
+@renderer('visual')
+def render_visual(img, layer, scene):
+    """Theme illustration; themes without a placement in the layout draw nothing"""
+    placement = layer.get('placements', {}).get(layer['theme'])
+    if placement is None or layer['theme'] not in THEMES:
+        return img
+    params = dict(placement, color=color(placement['color']))
+    return THEMES[layer['theme']](img, **params)
+
+
+@renderer('text')
+def render_text(img, layer, scene):
+    draw = ImageDraw.Draw(img, 'RGBA')
+    font = get_font(layer['size'])
+    x, y = layer['position']
+    shadow = layer.get('shadow')
+    if shadow:
+        dx, dy = shadow['offset']
+        draw.text((x + dx, y + dy), layer['text'], font=font, fill=color(shadow['fill']))
+    draw.text((x, y), layer['text'], font=font, fill=color(layer.get('fill', (255, 255, 255))))
+    return img
+
+
+@renderer('badges')
+def render_badges(img, layer, scene):
+    """Rounded badges in a row; width/step fixed, or fitted to each label"""
+    draw = ImageDraw.Draw(img, 'RGBA')
+    font = get_font(layer['size'])
+    x, y = layer['origin']
+    pad_x, pad_y = layer.get('padding', (10, 6))
+    outline = color(layer['outline']) if 'outline' in layer else None
+    items = layer['items'][:layer['limit']] if 'limit' in layer else layer['items']
+    for item in items:
+        bbox = draw.textbbox((0, 0), item, font=font)
+        width = layer.get('width') or bbox[2] - bbox[0] + 2 * pad_x
+        draw.rounded_rectangle([x, y, x + width, y + layer['height']],
+                               radius=layer.get('radius', 0), fill=color(layer['fill']),
+                               outline=outline, width=1 if outline else 0)
+        draw.text((x + pad_x, y + pad_y), item, font=font,
+                  fill=color(layer.get('text_fill', (255, 255, 255))))
+        x += layer.get('step') or width + layer.get('gap', 0)
+    return img
+
+
+def render_layer(img, layer, scene):
+    return RENDERERS[layer['type']](img, layer, scene)
+
+
+# Batch planning and rendering
+
+def stack_keys(scene):
+    """Hash of each layer stack of scene, bottom layer first"""
+    digest = hashlib.sha256(json.dumps([scene['size'], scene['mode']]).encode())
+    keys = []
+    for layer in scene['layers']:
+        digest.update(json.dumps(layer, sort_keys=True).encode())
+        keys.append(digest.copy().hexdigest())
+    return keys
+
+
+def plan(scenes):
+    """Distinct layer stacks of a batch of scenes, in dependency order
+
+    Scenes that start with the same layers share those stacks, so a
+    background used by five cards appears once. Steps are ordered depth
+    first: each follows the stack it is drawn on, and the siblings on a
+    stack come together so the stack can be released after the last one.
+    """
+    steps = {}
+    children = {None: []}
+    for scene in scenes:
+        if not scene['layers']:
+            raise ValueError(f"Scene {scene['name']} has no layers")
+        parent = None
+        for layer, key in zip(scene['layers'], stack_keys(scene)):
+            if key not in steps:
+                cached = layer['type'] in CACHED_LAYERS and (parent is None or steps[parent].cached)
+                steps[key] = Step(key, parent, layer, scene, [], cached)
+                children[parent].append(key)
+                children[key] = []
+            parent = key
+        steps[parent].outputs.append(scene['name'])
+
+    order = []
+    pending = list(reversed(children[None]))
+    while pending:
+        key = pending.pop()
+        order.append(steps[key])
+        pending.extend(reversed(children[key]))
+    return order
+
+
+def render_scenes(scenes, cache=layer_cache):
+    """Render a batch of scenes; returns {scene name: image}
+
+    Each distinct stack is drawn once on a copy of the stack below it (the
+    last stack built on it takes it over without copying). Stacks made
+    only of CACHED_LAYERS go through `cache` instead and are fetched from
+    it on demand, so later batches in the same process reuse shared
+    backgrounds and panels without redrawing them.
+    """
+    order = plan(scenes)
+    steps = {step.key: step for step in order}
+    waiting = Counter(step.parent for step in order)
+    images = {}
+
+    def lazy(step):
+        return step.cached and cache is not None
+
+    def take(key):
+        """Image of stack key for one of the stacks drawn on it"""
+        waiting[key] -= 1
+        if key in images:
+            return images[key].copy() if waiting[key] > 0 else images.pop(key)
+        return build(steps[key])
+
+    def build(step):
+        def draw():
+            below = None if step.parent is None else take(step.parent)
+            return render_layer(below, step.layer, step.scene)
+        if lazy(step):
+            return cache.get('scene', step.scene['size'], step.key, draw)
+        return draw()
+
+    results = {}
+    for step in order:
+        has_children = waiting[step.key] > 0
+        if not step.outputs and (lazy(step) or not has_children):
+            continue
+        img = build(step)
+        mode = step.scene['mode']
+        for name in step.outputs:
+            output = img.copy() if has_children or len(step.outputs) > 1 else img
+            results[name] = output if output.mode == mode else output.convert(mode)
+        if has_children and not lazy(step):
+            images[step.key] = img
+    return results
+
+
+def render_scene(scene, cache=layer_cache):
+    """Render one scene (a batch of one; shared stacks still hit the cache)"""
+    return render_scenes([scene], cache)[scene['name']]
+
+
+def batch_stats(scenes):
+    """Layer count of a batch before and after deduplication"""
+    scenes = list(scenes)
+    return {
+        'scenes': len(scenes),
+        'layers': sum(len(scene['layers']) for scene in scenes),
+        'unique_layers': len(plan(scenes)),
+    }
@@ -1,34 +1,142 @@
 #!/usr/bin/env python3
-"""Create simple favicon without font issues"""
+"""
+Create the favicon set from one high-resolution master
+Renders the MS icon once, downsamples it to every PNG size, a multi-size
+ICO, an apple-touch icon and maskable variants, and writes the web
+manifest icon list in the same pass
+"""
+
+import argparse
+import json
+from pathlib import Path
 
 from PIL import Image, ImageDraw
 
-def create_favicon():
-    """Create a simple gradient favicon with MS initials"""
-    size = 32
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
-    # Draw gradient background
-    draw.rounded_rectangle([0, 0, size, size], 
-                          radius=size//4, 
-                          fill=(37, 99, 235, 255))  # Primary blue
-    
-    # Draw simple MS using lines
+from asset_encoder import encode
+from font_registry import SANS_FACES, fonts
+
+DEFAULT_OUTPUT_DIR = Path("/Users/matthewscott/Projects/portfolio-website/assets")
+MASTER_SIZE = 1024
+PNG_SIZES = [16, 32, 48, 64, 128, 192, 256, 512]
+ICO_SIZES = [16, 32, 48, 64, 128, 256]
+APPLE_TOUCH_SIZE = 180
+MASKABLE_SIZES = [192, 512]
+# Maskable icons must keep their content inside the central 80% circle
+MASKABLE_SAFE_ZONE = 0.8
+PRIMARY = (37, 99, 235)  # Primary blue
+MANIFEST_NAME = "site.webmanifest"
+# Browsers and the web manifest expect PNG icons, so only PNG encodings compete
+PNG_FORMATS = ('png-palette', 'png')
+
+
+def draw_initials(draw, box):
+    """MS initials centred in box: real font if installed, strokes otherwise"""
+    left, top, right, bottom = box
+    scale = (right - left) / 32
+    if fonts.find(*SANS_FACES):
+        draw.text(((left + right) / 2, (top + bottom) / 2), "MS",
+                  font=fonts.font(round(16 * scale)), fill=(255, 255, 255), anchor='mm')
+        return
+
+    # The original 32px stroke design, scaled to the box
+    def at(x, y):
+        return (left + x * scale, top + y * scale)
+
+    width = max(1, round(2 * scale))
     # M
-    draw.line([(8, 22), (8, 10)], fill=(255, 255, 255), width=2)
-    draw.line([(8, 10), (12, 16)], fill=(255, 255, 255), width=2)
-    draw.line([(12, 16), (16, 10)], fill=(255, 255, 255), width=2)
-    draw.line([(16, 10), (16, 22)], fill=(255, 255, 255), width=2)
-    
+    draw.line([at(8, 22), at(8, 10)], fill=(255, 255, 255), width=width)
+    draw.line([at(8, 10), at(12, 16)], fill=(255, 255, 255), width=width)
+    draw.line([at(12, 16), at(16, 10)], fill=(255, 255, 255), width=width)
+    draw.line([at(16, 10), at(16, 22)], fill=(255, 255, 255), width=width)
+
     # S
-    draw.arc([(18, 10), (24, 16)], 90, 270, fill=(255, 255, 255), width=2)
-    draw.arc([(18, 16), (24, 22)], -90, 90, fill=(255, 255, 255), width=2)
-    
-    # Save
-    img.save('/Users/matthewscott/Projects/portfolio-website/assets/favicon.ico')
-    img.save('/Users/matthewscott/Projects/portfolio-website/assets/favicon.png')
-    print("✅ Created favicon.ico and favicon.png")
+    draw.arc([at(18, 10), at(24, 16)], 90, 270, fill=(255, 255, 255), width=width)
+    draw.arc([at(18, 16), at(24, 22)], -90, 90, fill=(255, 255, 255), width=width)
+
+
+def render_master(size=MASTER_SIZE, color=PRIMARY, maskable=False):
+    """The icon at full resolution
+
+    The regular master is a rounded square on transparency. The maskable
+    one is a full-bleed opaque square with the initials shrunk into the
+    safe zone, since the platform applies its own mask shape.
+    """
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    if maskable:
+        draw.rectangle([0, 0, size, size], fill=(*color, 255))
+        inset = size * (1 - MASKABLE_SAFE_ZONE) / 2
+        draw_initials(draw, (inset, inset, size - inset, size - inset))
+    else:
+        draw.rounded_rectangle([0, 0, size, size], radius=size // 4, fill=(*color, 255))
+        draw_initials(draw, (0, 0, size, size))
+    return img
+
+
+def downsample(master, size):
+    return master.resize((size, size), Image.LANCZOS, reducing_gap=3.0)
+
+
+def output_names(png_sizes=PNG_SIZES, maskable_sizes=MASKABLE_SIZES):
+    """Every file create_favicons writes"""
+    return ([f"favicon_{size}x{size}.png" for size in png_sizes]
+            + [f"maskable_icon_{size}x{size}.png" for size in maskable_sizes]
+            + ["apple-touch-icon.png", "favicon.png", "favicon.ico", MANIFEST_NAME])
+
+
+def create_favicons(output_dir=DEFAULT_OUTPUT_DIR, color=PRIMARY, master_size=MASTER_SIZE,
+                    png_sizes=PNG_SIZES, maskable_sizes=MASKABLE_SIZES):
+    """Write the whole favicon set from one master; returns the manifest icon list"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    master = render_master(master_size, color)
+
+    icons = {size: downsample(master, size) for size in set(png_sizes) | set(ICO_SIZES) | {32}}
+    for size in png_sizes:
+        encode(icons[size], output_dir / f"favicon_{size}x{size}.png", PNG_FORMATS)
+    encode(icons[32], output_dir / "favicon.png", PNG_FORMATS)
+
+    # One ICO holding every size, each frame our own downsample
+    largest, *smaller = sorted(ICO_SIZES, reverse=True)
+    icons[largest].save(output_dir / "favicon.ico", sizes=[(s, s) for s in ICO_SIZES],
+                        append_images=[icons[size] for size in smaller])
+
+    # iOS fills transparent corners with black, so flatten onto the brand colour
+    apple = Image.new('RGBA', (APPLE_TOUCH_SIZE, APPLE_TOUCH_SIZE), (*color, 255))
+    apple.alpha_composite(downsample(master, APPLE_TOUCH_SIZE))
+    encode(apple.convert('RGB'), output_dir / "apple-touch-icon.png", PNG_FORMATS)
+
+    maskable_master = render_master(master_size, color, maskable=True)
+    for size in maskable_sizes:
+        encode(downsample(maskable_master, size), output_dir / f"maskable_icon_{size}x{size}.png",
+               PNG_FORMATS)
+
+    manifest_icons = [
+        {'src': f"favicon_{size}x{size}.png", 'sizes': f"{size}x{size}", 'type': 'image/png'}
+        for size in png_sizes if size >= 48
+    ] + [
+        {'src': f"maskable_icon_{size}x{size}.png", 'sizes': f"{size}x{size}",
+         'type': 'image/png', 'purpose': 'maskable'}
+        for size in maskable_sizes
+    ]
+    with open(output_dir / MANIFEST_NAME, 'w') as f:
+        json.dump({'icons': manifest_icons}, f, indent=2)
+
+    print(f"✅ Created favicon.ico ({len(ICO_SIZES)} sizes), {len(png_sizes)} PNGs, "
+          f"apple-touch and {len(maskable_sizes)} maskable icons")
+    return manifest_icons
+
+
+def create_favicon(output_dir=DEFAULT_OUTPUT_DIR):
+    """Create the favicon set (kept for existing callers)"""
+    return create_favicons(output_dir)
+
 
 if __name__ == "__main__":
-    create_favicon()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create the favicon set")
+    parser.add_argument('--output-dir', default=str(DEFAULT_OUTPUT_DIR),
+                        help="folder to write the icons and web manifest to")
+    parser.add_argument('--master-size', type=int, default=MASTER_SIZE,
+                        help="resolution the icon is rendered at before downsampling")
+    args = parser.parse_args()
+    create_favicons(args.output_dir, master_size=args.master_size)
@@ -4,18 +4,29 @@ Generate professional portfolio assets using Adobe tools and Python
 Creates high-quality images for projects, skills, and visual elements
 """
 
+import argparse
 import os
 import json
+import sys
 import subprocess
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont, ImageFilter
+from PIL import ImageFilter
 import numpy as np
 
+from asset_build import BuildCache, Task, add_build_arguments, report_failures, run_tasks
+from asset_encoder import describe, encode_responsive, srcset_manifest
+from card_scene import build_scene, render_scene
+from create_favicon import create_favicons, output_names as favicon_outputs
+from portfolio_graphics import draw_network, linear_gradient, radial_disc, scatter_nodes
+
+# <img sizes> for project cards: full width on phones, a grid column above
+CARD_SIZES = "(max-width: 768px) 100vw, (max-width: 1200px) 50vw, 400px"
+
 class PortfolioAssetGenerator:
-    def __init__(self):
+    def __init__(self, output_dir=None):
         self.portfolio_dir = Path("/Users/matthewscott/Projects/portfolio-website")
-        self.assets_dir = self.portfolio_dir / "assets"
-        self.assets_dir.mkdir(exist_ok=True)
+        self.assets_dir = Path(output_dir) if output_dir else self.portfolio_dir / "assets"
+        self.assets_dir.mkdir(parents=bool(output_dir), exist_ok=True)
         
         # Define brand colors matching the portfolio
         self.colors = {
@@ -66,245 +77,160 @@ class PortfolioAssetGenerator:
                 'color': '#EF4444'
             }
         }
+        
+        # Skill category icons
+        self.skills = {
+            'ai_ml': {'icon': '🧠', 'color': '#7C3AED'},
+            'programming': {'icon': '💻', 'color': '#2563EB'},
+            'devops': {'icon': '🚀', 'color': '#10B981'},
+            'domains': {'icon': '🎯', 'color': '#F59E0B'}
+        }
     
     def hex_to_rgb(self, hex_color):
         """Convert hex color to RGB tuple"""
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
     
-    def create_gradient_image(self, width, height, color1, color2):
-        """Create a gradient image"""
-        img = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(img)
-        
-        c1 = self.hex_to_rgb(color1)
-        c2 = self.hex_to_rgb(color2)
-        
-        for y in range(height):
-            ratio = y / height
-            r = int(c1[0] * (1 - ratio) + c2[0] * ratio)
-            g = int(c1[1] * (1 - ratio) + c2[1] * ratio)
-            b = int(c1[2] * (1 - ratio) + c2[2] * ratio)
-            draw.line([(0, y), (width, y)], fill=(r, g, b))
-        
-        return img
+    def create_gradient_image(self, width, height, color1, color2, angle=180):
+        """Create a gradient image (angle in CSS degrees, 180 = top to bottom)"""
+        return linear_gradient((width, height),
+                               [self.hex_to_rgb(color1), self.hex_to_rgb(color2)],
+                               angle=angle)
+    
+    def card_scene(self, project_key, project_data):
+        """Project card scene: the 'portfolio' layout in card_scenes.json"""
+        context = {**self.colors, **project_data, 'key': project_key}
+        return build_scene('portfolio', f"{project_key}_card", context)
     
     def create_project_card(self, project_key, project_data):
         """Create a professional project card image"""
-        width, height = 800, 600
-        
-        # Create base gradient
-        img = self.create_gradient_image(width, height, 
-                                        project_data['color'], 
-                                        self.colors['dark'])
-        
-        # Add overlay pattern
-        draw = ImageDraw.Draw(img, 'RGBA')
-        
-        # Add circuit pattern overlay
-        for i in range(0, width, 50):
-            for j in range(0, height, 50):
-                if np.random.random() > 0.7:
-                    draw.ellipse([i-2, j-2, i+2, j+2], 
-                               fill=(255, 255, 255, 30))
-                    if np.random.random() > 0.5 and i < width-50:
-                        draw.line([(i, j), (i+50, j)], 
-                                fill=(255, 255, 255, 20), width=1)
-                    if np.random.random() > 0.5 and j < height-50:
-                        draw.line([(i, j), (i, j+50)], 
-                                fill=(255, 255, 255, 20), width=1)
-        
-        # Try to use system font, fallback to default
-        try:
-            title_font = ImageFont.truetype('/System/Library/Fonts/Helvetica.ttc', 48)
-            subtitle_font = ImageFont.truetype('/System/Library/Fonts/Helvetica.ttc', 24)
-            desc_font = ImageFont.truetype('/System/Library/Fonts/Helvetica.ttc', 18)
-        except:
-            title_font = ImageFont.load_default()
-            subtitle_font = ImageFont.load_default()
-            desc_font = ImageFont.load_default()
-        
-        # Add text with shadow effect
-        shadow_offset = 3
-        
-        # Title shadow
-        draw.text((52, 52), project_data['title'], 
-                 font=title_font, fill=(0, 0, 0, 100))
-        # Title
-        draw.text((50, 50), project_data['title'], 
-                 font=title_font, fill=(255, 255, 255, 255))
-        
-        # Subtitle
-        draw.text((50, 120), project_data['subtitle'], 
-                 font=subtitle_font, fill=(255, 255, 255, 200))
-        
-        # Description
-        draw.text((50, 170), project_data['description'], 
-                 font=desc_font, fill=(255, 255, 255, 180))
-        
-        # Tech stack badges
-        badge_y = height - 100
-        badge_x = 50
-        for tech in project_data['tech'][:3]:
-            # Badge background
-            bbox = draw.textbbox((0, 0), tech, font=desc_font)
-            width_text = bbox[2] - bbox[0]
-            
-            draw.rounded_rectangle([badge_x, badge_y, 
-                                   badge_x + width_text + 20, badge_y + 30],
-                                  radius=15, fill=(255, 255, 255, 40))
-            draw.text((badge_x + 10, badge_y + 6), tech, 
-                     font=desc_font, fill=(255, 255, 255, 220))
-            badge_x += width_text + 40
+        # Gradient, circuit pattern, text and badges all come from the layout
+        img = render_scene(self.card_scene(project_key, project_data))
         
         # Save image
-        filename = f"{project_key}_card.png"
-        img.save(self.assets_dir / filename, quality=95)
-        print(f"✅ Created {filename}")
+        encoded = encode_responsive(img, self.assets_dir / f"{project_key}_card.png", CARD_SIZES)
+        filename = encoded.file
+        print(f"✅ Created {filename} ({describe(encoded)})")
         
         return filename
     
-    def create_hero_background(self):
-        """Create an animated-style hero background"""
-        width, height = 1920, 1080
+    def create_hero_background(self, nodes=30, radius=300, size=(1920, 1080), seed=None):
+        """Create an animated-style hero background
+        
+        nodes and radius control the neural network overlay: node count and
+        the distance below which two nodes are connected.
+        """
+        width, height = size
         
-        # Create base gradient
+        # Create base gradient (same 135deg sweep as the site's CSS)
         img = self.create_gradient_image(width, height,
                                         self.colors['gradient_start'],
-                                        self.colors['gradient_end'])
+                                        self.colors['gradient_end'],
+                                        angle=135)
         
-        # Add neural network pattern
-        draw = ImageDraw.Draw(img, 'RGBA')
-        
-        # Create nodes
-        nodes = []
-        for _ in range(30):
-            x = np.random.randint(100, width-100)
-            y = np.random.randint(100, height-100)
-            nodes.append((x, y))
-            # Draw node
-            draw.ellipse([x-5, y-5, x+5, y+5], 
-                        fill=(255, 255, 255, 100))
-            draw.ellipse([x-3, y-3, x+3, y+3], 
-                        fill=(255, 255, 255, 200))
-        
-        # Connect some nodes
-        for i, node1 in enumerate(nodes):
-            for j, node2 in enumerate(nodes[i+1:], i+1):
-                dist = np.sqrt((node1[0]-node2[0])**2 + (node1[1]-node2[1])**2)
-                if dist < 300:
-                    opacity = int(100 * (1 - dist/300))
-                    draw.line([node1, node2], 
-                            fill=(255, 255, 255, opacity), width=1)
+        # Add neural network pattern: evenly spread nodes, edges via grid hash
+        if seed is None:
+            seed = np.random.randint(2**31)  # follow the global random state
+        points = scatter_nodes((width, height), nodes, margin=100, seed=seed)
+        draw_network(img, points, radius)
         
         # Apply slight blur for depth
         img = img.filter(ImageFilter.GaussianBlur(radius=1))
         
         # Save
-        filename = "hero_background.png"
-        img.save(self.assets_dir / filename, quality=95)
-        print(f"✅ Created {filename}")
+        encoded = encode_responsive(img, self.assets_dir / "hero_background.png", "100vw")
+        filename = encoded.file
+        print(f"✅ Created {filename} ({describe(encoded)})")
         
         return filename
     
-    def create_skill_icons(self):
-        """Create professional skill category icons"""
-        skills = {
-            'ai_ml': {'icon': '🧠', 'color': '#7C3AED'},
-            'programming': {'icon': '💻', 'color': '#2563EB'},
-            'devops': {'icon': '🚀', 'color': '#10B981'},
-            'domains': {'icon': '🎯', 'color': '#F59E0B'}
-        }
-        
-        for skill_key, skill_data in skills.items():
-            width, height = 200, 200
-            
-            # Create circular gradient
-            img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
+    def create_skill_icons(self, scale=2):
+        """Create professional skill category icons
+        
+        Icons are rendered at `scale` times their 200px size and written as
+        the @<scale>x file plus the 1x icon downsampled from it.
+        """
+        for skill_key, skill_data in self.skills.items():
+            size = 200 * scale
             
-            # Draw gradient circle
+            # Circular gradient: transparent centre ramping to an opaque rim
             color_rgb = self.hex_to_rgb(skill_data['color'])
-            for i in range(100, 0, -1):
-                opacity = int(255 * (i/100))
-                draw.ellipse([100-i, 100-i, 100+i, 100+i],
-                           fill=(*color_rgb, opacity))
+            img = radial_disc((size, size), [(*color_rgb, 0), (*color_rgb, 255)])
             
             # Save
-            filename = f"skill_{skill_key}.png"
-            img.save(self.assets_dir / filename)
-            print(f"✅ Created {filename}")
+            encoded = encode_responsive(img, self.assets_dir / f"skill_{skill_key}.png", "200px",
+                                        scale=scale)
+            print(f"✅ Created {encoded.file} ({describe(encoded)})")
     
     def create_favicon(self):
-        """Create a professional favicon"""
-        sizes = [16, 32, 64, 128, 256]
-        
-        for size in sizes:
-            img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # Create gradient background
-            color1 = self.hex_to_rgb(self.colors['primary'])
-            color2 = self.hex_to_rgb(self.colors['secondary'])
-            
-            # Draw rounded square with gradient
-            draw.rounded_rectangle([0, 0, size, size], 
-                                  radius=size//4, 
-                                  fill=color1)
-            
-            # Add "MS" text
-            try:
-                font_size = size // 3
-                font = ImageFont.truetype('/System/Library/Fonts/Helvetica.ttc', font_size)
-            except:
-                font = ImageFont.load_default()
-            
-            draw.text((size//4, size//3), "MS", 
-                     font=font, fill=(255, 255, 255, 255))
-            
-            # Save
-            filename = f"favicon_{size}x{size}.png"
-            img.save(self.assets_dir / filename)
-            print(f"✅ Created {filename}")
+        """Create the favicon set (rendered once, downsampled to every size)"""
+        return create_favicons(self.assets_dir, self.hex_to_rgb(self.colors['primary']))
+    
+    def render_tasks(self):
+        """Independent render steps of generate_all_assets, in output order
+        
+        Each task lists the files it writes and the data it reads, which is
+        what the build cache hashes to decide whether it can be skipped.
+        """
+        tasks = [Task("📦 Creating Project Cards...", f"card:{key}", 'create_project_card',
+                      (key, data), (f"{key}_card.png",),
+                      {'colors': self.colors, 'scene': self.card_scene(key, data)})
+                 for key, data in self.projects.items()]
+        tasks.append(Task("🌟 Creating Hero Background...", "hero", 'create_hero_background', (),
+                          ("hero_background.png",), {'colors': self.colors}))
+        tasks.append(Task("🎯 Creating Skill Icons...", "skill_icons", 'create_skill_icons', (),
+                          tuple(f"skill_{key}.png" for key in self.skills), {'skills': self.skills}))
+        tasks.append(Task("🔰 Creating Favicons...", "favicons", 'create_favicon', (),
+                          tuple(favicon_outputs()), {'colors': self.colors}))
+        return tasks
     
-    def generate_all_assets(self):
-        """Generate all portfolio assets"""
+    def generate_all_assets(self, jobs=1, force=False):
+        """Generate all portfolio assets (jobs > 1 renders on a process pool)
+        
+        Assets whose inputs and files match the previous manifest are skipped
+        unless force is set.
+        """
         print("🎨 Generating Portfolio Assets...")
         print("=" * 50)
         
-        # Create project cards
-        print("\n📦 Creating Project Cards...")
-        for key, data in self.projects.items():
-            self.create_project_card(key, data)
-        
-        # Create hero background
-        print("\n🌟 Creating Hero Background...")
-        self.create_hero_background()
-        
-        # Create skill icons
-        print("\n🎯 Creating Skill Icons...")
-        self.create_skill_icons()
+        cache = BuildCache.load(self, self.assets_dir)
+        if force:
+            cache.previous = {}
+        results = run_tasks(self, self.render_tasks(), jobs, cache)
+        failed = report_failures(results)
         
-        # Create favicons
-        print("\n🔰 Creating Favicons...")
-        self.create_favicon()
-        
-        # Create assets manifest
+        # Create assets manifest once every task has finished
         manifest = {
             'projects': list(self.projects.keys()),
-            'assets': os.listdir(self.assets_dir),
+            'assets': sorted(name for name in os.listdir(self.assets_dir)
+                             if name not in ('manifest.json', 'srcset.json')),
             'colors': self.colors,
-            'generated': True
+            'generated': not failed,
+            'encoding': cache.encoding_summary(),
+            'build': dict(sorted(cache.entries.items()))
         }
+        if failed:
+            manifest['failed'] = failed
         
         with open(self.assets_dir / 'manifest.json', 'w') as f:
             json.dump(manifest, f, indent=2)
         
-        print("\n✨ All assets generated successfully!")
+        # Responsive variants per logical asset, ready for srcset/sizes
+        with open(self.assets_dir / 'srcset.json', 'w') as f:
+            json.dump(srcset_manifest(cache.encodings()), f, indent=2)
+        
+        if failed:
+            print(f"\n⚠️  Assets generated with {len(failed)} failure(s)")
+        else:
+            print("\n✨ All assets generated successfully!")
         print(f"📁 Assets saved to: {self.assets_dir}")
         
-        return True
+        return not failed
 
 if __name__ == "__main__":
-    generator = PortfolioAssetGenerator()
-    generator.generate_all_assets()
\ No newline at end of file
+    parser = add_build_arguments(argparse.ArgumentParser(description="Generate portfolio assets"))
+    parser.add_argument('--force', action='store_true',
+                        help="re-render every asset even if the build cache says it is up to date")
+    args = parser.parse_args()
+    generator = PortfolioAssetGenerator(args.output_dir)
+    sys.exit(0 if generator.generate_all_assets(args.jobs, args.force) else 1)
@@ -4,19 +4,31 @@ Create premium portfolio visuals using Python
 Elevates the portfolio with professional graphics
 """
 
+import argparse
+import json
 import os
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
-import numpy as np
+from html import escape
+from PIL import Image, ImageDraw, ImageEnhance
 from pathlib import Path
 import colorsys
-import math
+
+from asset_build import Task, add_build_arguments, report_failures, run_tasks
+from asset_encoder import encode_responsive, encoding_info, srcset_manifest
+from card_scene import build_scene, network_hub, neural_network, render_scene, security_matrix
+from font_registry import get_font
+from portfolio_graphics import blur_padding, blur_region, blurred_disc, radial_disc
+
+# <img sizes> matching styles.css: cards fill a grid column, the avatar is
+# capped at 400px (300px on phones)
+CARD_SIZES = "(max-width: 768px) 100vw, (max-width: 1200px) 50vw, 400px"
+AVATAR_SIZES = "(max-width: 768px) 300px, 400px"
 
 class PremiumPortfolioVisuals:
     """Generate high-quality portfolio visuals"""
     
-    def __init__(self):
-        self.output_dir = Path("/Users/matthewscott/Projects/OurJourney/premium_assets")
-        self.output_dir.mkdir(exist_ok=True)
+    def __init__(self, output_dir=None):
+        self.output_dir = Path(output_dir or "/Users/matthewscott/Projects/OurJourney/premium_assets")
+        self.output_dir.mkdir(parents=bool(output_dir), exist_ok=True)
         
         # Premium color palette
         self.colors = {
@@ -38,7 +50,7 @@ class PremiumPortfolioVisuals:
                 'description': 'Metacognitive Evolution Simulator',
                 'stats': ['Theory of Mind', 'Neural Modeling', 'Python'],
                 'color_scheme': 'purple',
-                'icon': 'brain'
+                'visual_theme': 'neural_network'
             },
             'mirador': {
                 'title': 'MIRADOR',
@@ -46,7 +58,7 @@ class PremiumPortfolioVisuals:
                 'description': '78 Models, Sub-10s Routing',
                 'stats': ['95+ Components', 'Production Scale', 'ROI Tracking'],
                 'color_scheme': 'blue',
-                'icon': 'network'
+                'visual_theme': 'network_hub'
             },
             'security': {
                 'title': 'SECURITY COPILOT',
@@ -54,7 +66,7 @@ class PremiumPortfolioVisuals:
                 'description': '98% Accuracy in Real-Time',
                 'stats': ['Phishing Detection', 'API Framework', 'Real-time'],
                 'color_scheme': 'green',
-                'icon': 'shield'
+                'visual_theme': 'security_matrix'
             },
             'legalstream': {
                 'title': 'LEGALSTREAM',
@@ -62,7 +74,7 @@ class PremiumPortfolioVisuals:
                 'description': 'AI-Powered Legal Analysis',
                 'stats': ['OCR Integration', 'Docker', 'Full-Stack'],
                 'color_scheme': 'indigo',
-                'icon': 'document'
+                'visual_theme': 'document_flow'
             },
             'chord': {
                 'title': 'CHORD GENERATOR',
@@ -70,16 +82,12 @@ class PremiumPortfolioVisuals:
                 'description': 'Interactive Music Theory',
                 'stats': ['Audio Processing', 'Music Theory', 'Visualization'],
                 'color_scheme': 'purple',
-                'icon': 'music'
+                'visual_theme': 'sound_waves'
             }
         }
     
-    def create_gradient_background(self, width, height, color_scheme='blue'):
-        """Create a premium gradient background"""
-        img = Image.new('RGB', (width, height))
-        draw = ImageDraw.Draw(img)
-        
-        # Define gradient colors based on scheme
+    def scheme_colors(self, color_scheme='blue'):
+        """Gradient start and end colour of a colour scheme"""
         schemes = {
             'blue': (self.colors['primary_blue'], self.colors['gradient_end']),
             'purple': (self.colors['primary_purple'], self.colors['gradient_start']),
@@ -87,226 +95,99 @@ class PremiumPortfolioVisuals:
             'indigo': ((79, 70, 229), (147, 51, 234))
         }
         
-        start_color, end_color = schemes.get(color_scheme, schemes['blue'])
-        
-        # Create smooth gradient
-        for i in range(height):
-            ratio = i / height
-            r = int(start_color[0] * (1 - ratio) + end_color[0] * ratio)
-            g = int(start_color[1] * (1 - ratio) + end_color[1] * ratio)
-            b = int(start_color[2] * (1 - ratio) + end_color[2] * ratio)
-            draw.rectangle([(0, i), (width, i + 1)], fill=(r, g, b))
-        
-        # Add noise texture for premium feel
-        noise = Image.new('L', (width, height))
-        noise_draw = ImageDraw.Draw(noise)
-        for _ in range(5000):
-            x = np.random.randint(0, width)
-            y = np.random.randint(0, height)
-            brightness = np.random.randint(200, 255)
-            noise_draw.point((x, y), fill=brightness)
-        
-        noise = noise.filter(ImageFilter.GaussianBlur(radius=1))
-        img = Image.blend(img, Image.new('RGB', (width, height), (255, 255, 255)), 0.05)
-        
-        return img
+        return schemes.get(color_scheme, schemes['blue'])
+    
+    def create_gradient_background(self, width, height, color_scheme='blue', angle=180):
+        """Create a premium gradient background (angle in CSS degrees)
+        
+        This is the gradient and grain the 'premium' layout starts with, so
+        at card size it is the same cached layer stack the cards are drawn on.
+        """
+        start_color, end_color = self.scheme_colors(color_scheme)
+        scene = build_scene('premium', f"{color_scheme}_background",
+                            {'scheme_start': start_color, 'scheme_end': end_color},
+                            size=(width, height), leading=('gradient', 'grain'))
+        for layer in scene['layers']:
+            if layer['type'] == 'gradient':
+                layer['angle'] = angle
+        return render_scene(scene)
     
     def draw_neural_network(self, draw, x_start, y_start, width, height, color):
-        """Draw a neural network visualization"""
-        layers = [4, 6, 6, 3]  # Nodes per layer
-        layer_spacing = width // (len(layers) + 1)
+        """Draw a neural network visualization (the card_scene theme)
         
-        nodes = []
-        for layer_idx, num_nodes in enumerate(layers):
-            layer_nodes = []
-            x = x_start + layer_spacing * (layer_idx + 1)
-            node_spacing = height // (num_nodes + 1)
-            
-            for node_idx in range(num_nodes):
-                y = y_start + node_spacing * (node_idx + 1)
-                layer_nodes.append((x, y))
-                
-                # Draw node with glow effect
-                for radius in range(15, 0, -1):
-                    opacity = int(255 * (radius / 15) * 0.3)
-                    glow_color = (*color, opacity) if len(color) == 3 else color
-                    draw.ellipse(
-                        [x - radius, y - radius, x + radius, y + radius],
-                        fill=glow_color[:3] if opacity < 255 else glow_color,
-                        outline=None
-                    )
-            
-            nodes.append(layer_nodes)
-        
-        # Draw connections
-        for layer_idx in range(len(layers) - 1):
-            for node1 in nodes[layer_idx]:
-                for node2 in nodes[layer_idx + 1]:
-                    # Draw connection with gradient opacity
-                    draw.line([node1, node2], fill=(*color, 100), width=1)
+        draw is the image, or an ImageDraw on it as callers used to pass.
+        """
+        image = getattr(draw, '_image', draw)
+        neural_network(image, (x_start, y_start, width, height), tuple(color))
     
     def draw_network_hub(self, draw, center_x, center_y, radius, color):
-        """Draw a network hub visualization"""
-        # Central hub
-        draw.ellipse(
-            [center_x - 30, center_y - 30, center_x + 30, center_y + 30],
-            fill=color, outline='white', width=3
-        )
-        
-        # Orbiting nodes
-        num_nodes = 8
-        for i in range(num_nodes):
-            angle = (2 * math.pi * i) / num_nodes
-            x = center_x + radius * math.cos(angle)
-            y = center_y + radius * math.sin(angle)
-            
-            # Node
-            draw.ellipse([x - 15, y - 15, x + 15, y + 15], fill=color, outline='white', width=2)
-            
-            # Connection to hub
-            draw.line([(center_x, center_y), (x, y)], fill=(*color, 150), width=2)
-            
-            # Secondary connections
-            next_angle = (2 * math.pi * ((i + 1) % num_nodes)) / num_nodes
-            next_x = center_x + radius * math.cos(next_angle)
-            next_y = center_y + radius * math.sin(next_angle)
-            draw.line([(x, y), (next_x, next_y)], fill=(*color, 100), width=1)
+        """Draw a network hub visualization (the card_scene theme)"""
+        image = getattr(draw, '_image', draw)
+        network_hub(image, (center_x, center_y), radius, tuple(color))
     
     def draw_shield_icon(self, draw, x, y, size, color):
-        """Draw a shield security icon"""
-        points = [
-            (x, y - size),  # Top center
-            (x + size * 0.8, y - size * 0.8),  # Top right
-            (x + size * 0.9, y - size * 0.3),  # Right upper
-            (x + size * 0.9, y + size * 0.3),  # Right lower
-            (x, y + size),  # Bottom center
-            (x - size * 0.9, y + size * 0.3),  # Left lower
-            (x - size * 0.9, y - size * 0.3),  # Left upper
-            (x - size * 0.8, y - size * 0.8),  # Top left
-        ]
-        
-        # Shield with gradient effect
-        draw.polygon(points, fill=color, outline='white', width=3)
-        
-        # Check mark inside
-        check_points = [
-            (x - size * 0.3, y),
-            (x - size * 0.1, y + size * 0.3),
-            (x + size * 0.4, y - size * 0.3)
-        ]
-        draw.line(check_points, fill='white', width=4, joint='curve')
+        """Draw a shield security icon (the card_scene security_matrix theme)"""
+        image = getattr(draw, '_image', draw)
+        security_matrix(image, (x, y), size, tuple(color))
+    
+    def card_scene(self, project_key, project_data):
+        """Project card scene: the 'premium' layout in card_scenes.json"""
+        start_color, end_color = self.scheme_colors(project_data['color_scheme'])
+        context = {**self.colors, **project_data, 'key': project_key,
+                   'scheme_start': start_color, 'scheme_end': end_color}
+        return build_scene('premium', f"{project_key}_premium_card", context)
     
     def create_project_card(self, project_key, project_data):
         """Create a premium project card visual"""
-        width, height = 1200, 675  # 16:9 aspect ratio
-        
-        # Create base image with gradient
-        img = self.create_gradient_background(width, height, project_data['color_scheme'])
-        draw = ImageDraw.Draw(img, 'RGBA')
-        
-        # Add glass morphism effect overlay
-        overlay = Image.new('RGBA', (width, height), (255, 255, 255, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        
-        # Glass card background
-        card_rect = [50, 50, width - 50, height - 50]
-        overlay_draw.rounded_rectangle(
-            card_rect, radius=30,
-            fill=(255, 255, 255, 30),
-            outline=(255, 255, 255, 60),
-            width=2
-        )
-        
-        # Apply blur for glass effect
-        overlay = overlay.filter(ImageFilter.GaussianBlur(radius=2))
-        img = Image.alpha_composite(img.convert('RGBA'), overlay)
-        draw = ImageDraw.Draw(img)
-        
-        # Draw visualization based on project type
-        if project_data['icon'] == 'brain':
-            self.draw_neural_network(draw, 600, 150, 500, 400, self.colors['accent'])
-        elif project_data['icon'] == 'network':
-            self.draw_network_hub(draw, 850, 350, 150, self.colors['primary_blue'])
-        elif project_data['icon'] == 'shield':
-            self.draw_shield_icon(draw, 850, 350, 100, self.colors['success'])
-        
-        # Add text with fallback font
-        try:
-            title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 72)
-            subtitle_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 36)
-            desc_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24)
-        except:
-            title_font = ImageFont.load_default()
-            subtitle_font = ImageFont.load_default()
-            desc_font = ImageFont.load_default()
-        
-        # Title
-        draw.text((100, 100), project_data['title'], fill='white', font=title_font)
-        
-        # Subtitle
-        draw.text((100, 200), project_data['subtitle'], fill=(230, 230, 255), font=subtitle_font)
-        
-        # Description
-        draw.text((100, 260), project_data['description'], fill=(200, 200, 255), font=desc_font)
-        
-        # Stats badges
-        badge_y = height - 150
-        for i, stat in enumerate(project_data['stats']):
-            badge_x = 100 + (i * 250)
-            # Badge background
-            draw.rounded_rectangle(
-                [badge_x, badge_y, badge_x + 200, badge_y + 40],
-                radius=20, fill=(255, 255, 255, 40),
-                outline=(255, 255, 255, 80), width=1
-            )
-            # Badge text
-            draw.text((badge_x + 20, badge_y + 10), stat, fill='white', font=desc_font)
+        # Background, glass panel, visual theme, text and badges come from
+        # the layout; the background and panel stacks are kept in the layer
+        # cache, so cards with the same colour scheme drawn in one process
+        # share them
+        img = render_scene(self.card_scene(project_key, project_data))
         
         # Save the image
-        output_path = self.output_dir / f"{project_key}_premium_card.png"
-        img.save(output_path, 'PNG', quality=95)
+        output_path = self.output_dir / encode_responsive(
+            img, self.output_dir / f"{project_key}_premium_card.png", CARD_SIZES).file
         print(f"✅ Created premium card: {output_path}")
         
         return output_path
     
-    def create_hero_avatar(self):
-        """Create a professional avatar/logo"""
-        size = 500
-        img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
+    def create_hero_avatar(self, scale=2):
+        """Create a professional avatar/logo
         
-        # Create gradient circle
-        for i in range(size // 2, 0, -1):
-            ratio = i / (size // 2)
-            r = int(self.colors['primary_blue'][0] * ratio + self.colors['primary_purple'][0] * (1 - ratio))
-            g = int(self.colors['primary_blue'][1] * ratio + self.colors['primary_purple'][1] * (1 - ratio))
-            b = int(self.colors['primary_blue'][2] * ratio + self.colors['primary_purple'][2] * (1 - ratio))
-            
-            draw.ellipse(
-                [size//2 - i, size//2 - i, size//2 + i, size//2 + i],
-                fill=(r, g, b)
-            )
-        
-        # Add initials
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 180)
-        except:
-            font = ImageFont.load_default()
+        Rendered at `scale` times its 500px size and written as the
+        @<scale>x file plus the 1x avatar downsampled from it.
+        """
+        size = 500 * scale
         
-        draw.text((size//2 - 85, size//2 - 90), "MS", fill='white', font=font)
+        # Create gradient circle: purple centre to blue rim
+        stops = (self.colors['primary_purple'], self.colors['primary_blue'])
+        disc = radial_disc((size, size), stops)
+        draw = ImageDraw.Draw(disc)
         
-        # Add glow effect
-        img = img.filter(ImageFilter.GaussianBlur(radius=2))
+        # Add initials
+        font = get_font(180 * scale)
+        position = (size//2 - 85 * scale, size//2 - 90 * scale)
+        draw.text(position, "MS", fill='white', font=font)
+        
+        # Add glow effect: the blurred disc is cached, so only the area the
+        # initials' glow reaches is blurred here and patched into a copy
+        img = blurred_disc((size, size), stops, 2 * scale).copy()
+        left, top, right, bottom = draw.textbbox(position, "MS", font=font)
+        pad = blur_padding(2 * scale)
+        box = (left - pad, top - pad, right + pad, bottom + pad)
+        blur_region(disc, box, 2 * scale)
+        img.paste(disc.crop(box), box[:2])
         
         # Save
-        output_path = self.output_dir / "hero_avatar.png"
-        img.save(output_path, 'PNG')
+        output_path = self.output_dir / encode_responsive(
+            img, self.output_dir / "hero_avatar.png", AVATAR_SIZES, scale=scale).file
         print(f"✅ Created hero avatar: {output_path}")
         
         return output_path
     
-    def create_tech_logos(self):
-        """Create stylized tech stack logos"""
+    def create_tech_logos(self, scale=2):
+        """Create stylized tech stack logos (rendered at `scale` times 200px)"""
         techs = {
             'Python': self.colors['primary_blue'],
             'Docker': self.colors['accent'],
@@ -316,45 +197,51 @@ class PremiumPortfolioVisuals:
         }
         
         for tech, color in techs.items():
-            img = Image.new('RGBA', (200, 200), (0, 0, 0, 0))
+            img = Image.new('RGBA', (200 * scale, 200 * scale), (0, 0, 0, 0))
             draw = ImageDraw.Draw(img)
             
             # Background circle
-            draw.ellipse([10, 10, 190, 190], fill=(*color, 30), outline=color, width=3)
+            draw.ellipse([10 * scale, 10 * scale, 190 * scale, 190 * scale],
+                         fill=(*color, 30), outline=color, width=3 * scale)
             
             # Tech initial
-            try:
-                font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 72)
-            except:
-                font = ImageFont.load_default()
+            font = get_font(72 * scale)
             
-            draw.text((100 - 20, 100 - 35), tech[0], fill=color, font=font)
+            draw.text(((100 - 20) * scale, (100 - 35) * scale), tech[0], fill=color, font=font)
             
             # Save
-            output_path = self.output_dir / f"tech_{tech.lower()}.png"
-            img.save(output_path, 'PNG')
+            output_path = self.output_dir / encode_responsive(
+                img, self.output_dir / f"tech_{tech.lower()}.png", "200px", scale=scale).file
             print(f"✅ Created tech logo: {output_path}")
     
-    def generate_all_visuals(self):
-        """Generate all premium portfolio visuals"""
+    def render_tasks(self):
+        """Independent render steps of generate_all_visuals, in output order"""
+        tasks = [Task("📸 Creating project cards...", f"card:{key}", 'create_project_card', (key, project))
+                 for key, project in self.projects.items()]
+        tasks.append(Task("👤 Creating hero avatar...", "hero_avatar", 'create_hero_avatar', ()))
+        tasks.append(Task("🔧 Creating tech logos...", "tech_logos", 'create_tech_logos', ()))
+        return tasks
+    
+    def generate_all_visuals(self, jobs=1):
+        """Generate all premium portfolio visuals (jobs > 1 renders on a process pool)"""
         print("\n🎨 Generating Premium Portfolio Visuals")
         print("=" * 50)
         
-        # Create project cards
-        print("\n📸 Creating project cards...")
-        for key, project in self.projects.items():
-            self.create_project_card(key, project)
+        results = run_tasks(self, self.render_tasks(), jobs)
+        failed = report_failures(results)
         
-        # Create hero avatar
-        print("\n👤 Creating hero avatar...")
-        self.create_hero_avatar()
-        
-        # Create tech logos
-        print("\n🔧 Creating tech logos...")
-        self.create_tech_logos()
+        # Responsive variants per logical asset, ready for srcset/sizes
+        encodings = {record.name: encoding_info(record)
+                     for result in results for record in result.encodings}
+        self.srcsets = srcset_manifest(encodings)
+        with open(self.output_dir / 'srcset.json', 'w') as f:
+            json.dump(self.srcsets, f, indent=2)
         
         print("\n" + "=" * 50)
-        print("✅ All premium visuals created!")
+        if failed:
+            print(f"⚠️  Premium visuals created with {len(failed)} failure(s)")
+        else:
+            print("✅ All premium visuals created!")
         print(f"📁 Output directory: {self.output_dir}")
         
         # Create integration HTML
@@ -362,6 +249,25 @@ class PremiumPortfolioVisuals:
         
         return self.output_dir
     
+    def picture(self, name, alt, folder="premium_assets"):
+        """<img> for an asset, wrapped in <picture> with a <source> per
+        alternate format (WebP/AVIF) when variants were written"""
+        entry = getattr(self, 'srcsets', {}).get(name)
+        if entry is None:
+            return f'<img src="{folder}/{name}" alt="{alt}">'
+        
+        def prefixed(srcset):
+            return ", ".join(f"{folder}/{part}" for part in srcset.split(", "))
+        
+        img = (f'<img src="{folder}/{entry["src"]}" srcset="{prefixed(entry["srcset"])}" '
+               f'sizes="{entry["sizes"]}" width="{entry["width"]}" height="{entry["height"]}" '
+               f'alt="{alt}">')
+        if not entry.get('sources'):
+            return img
+        sources = "".join(f'<source type="{source["type"]}" srcset="{prefixed(source["srcset"])}" '
+                          f'sizes="{entry["sizes"]}">' for source in entry['sources'])
+        return f"<picture>{sources}{img}</picture>"
+    
     def create_integration_guide(self):
         """Create HTML guide for integrating visuals"""
         html = f"""<!DOCTYPE html>
@@ -394,15 +300,16 @@ class PremiumPortfolioVisuals:
         
         # Add project cards
         for key in self.projects.keys():
-            img_path = f"premium_assets/{key}_premium_card.png"
+            picture = self.picture(f"{key}_premium_card.png", self.projects[key]['title'])
             html += f"""
             <div class="visual-card">
-                <img src="{img_path}" alt="{self.projects[key]['title']}">
+                {picture}
                 <h3>{self.projects[key]['title']}</h3>
             </div>
 """
         
-        html += """
+        avatar = escape(self.picture("hero_avatar.png", "Matthew Scott"), quote=False)
+        html += f"""
         </div>
         
         <h2>Integration Code</h2>
@@ -421,10 +328,12 @@ class PremiumPortfolioVisuals:
         <code>
 &lt;!-- Add to hero section --&gt;
 &lt;div class="hero-avatar"&gt;
-    &lt;img src="premium_assets/hero_avatar.png" alt="Matthew Scott"&gt;
+    {avatar}
 &lt;/div&gt;
         </code>
+        """
         
+        html += """
         <h3>CSS Enhancements</h3>
         <code>
 /* Glass morphism effect */
@@ -463,5 +372,7 @@ class PremiumPortfolioVisuals:
         print("   Open this file in your browser to see all visuals and integration code")
 
 if __name__ == "__main__":
-    generator = PremiumPortfolioVisuals()
-    generator.generate_all_visuals()
\ No newline at end of file
+    parser = add_build_arguments(argparse.ArgumentParser(description="Generate premium portfolio visuals"))
+    args = parser.parse_args()
+    generator = PremiumPortfolioVisuals(args.output_dir)
+    generator.generate_all_visuals(args.jobs)
\ No newline at end of file
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Font discovery and cached font handles shared by the asset generators
+Scans the fontconfig / platform font directories once, resolves face names
+to files and keeps an LRU of loaded FreeTypeFont objects per (face, size)
+"""
+
+import os
+import re
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+from PIL import ImageFont
+
+# Extra directory to search first, e.g. a checkout-local fonts/ folder
+FONT_DIR_ENV = 'PORTFOLIO_FONT_DIR'
+FONTCONFIG_FILES = ['/etc/fonts/fonts.conf', '/etc/fonts/local.conf']
+FONT_DIRS = [
+    '~/.fonts',
+    '~/.local/share/fonts',
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    '/System/Library/Fonts',
+    '/Library/Fonts',
+    '~/Library/Fonts',
+    os.path.join(os.environ.get('WINDIR', r'C:\Windows'), 'Fonts'),
+]
+FONT_EXTENSIONS = ('.ttf', '.otf', '.ttc')
+# Faces tried in order when a generator asks for the default sans-serif
+SANS_FACES = ('Helvetica', 'Arial', 'Liberation Sans', 'DejaVu Sans', 'Noto Sans')
+FONT_CACHE_SIZE = 32
+
+
+def normalize_face(name):
+    """'DejaVuSans-Bold.ttf' / 'DejaVu Sans Bold' -> 'dejavusansbold'"""
+    return re.sub(r'[^a-z0-9]', '', Path(name).stem.lower() if '.' in name else name.lower())
+
+
+def fontconfig_dirs(config_files=FONTCONFIG_FILES):
+    """<dir> entries of the fontconfig configuration, if there is one
+
+    Entries with prefix="xdg" are relative to $XDG_DATA_HOME and those with
+    prefix="relative" to the directory of the file that lists them, as
+    fontconfig itself resolves them.
+    """
+    dirs = []
+    for config in config_files:
+        try:
+            text = Path(config).read_text(errors='replace')
+        except OSError:
+            continue
+        for attrs, entry in re.findall(r'<dir\b([^>]*)>([^<]+)</dir>', text):
+            prefix = re.search(r'prefix\s*=\s*["\']([^"\']*)["\']', attrs)
+            prefix = prefix.group(1) if prefix else None
+            entry = entry.strip()
+            if prefix == 'xdg':
+                entry = os.path.join(os.environ.get('XDG_DATA_HOME') or '~/.local/share', entry)
+            elif prefix == 'relative':
+                entry = os.path.join(os.path.dirname(os.path.abspath(config)), entry)
+            dirs.append(entry)
+    return dirs
+
+
+class FontRegistry:
+    """Find font files once and hand out cached FreeTypeFont objects
+
+    Faces are matched by normalized file name, exactly first and then by
+    prefix ('DejaVu Sans' finds DejaVuSans.ttf before DejaVuSans-Bold.ttf).
+    When none of the requested faces exists the registry falls back to
+    Pillow's bundled default font at the requested size and reports the
+    missing faces once instead of failing silently on every draw.
+    """
+
+    def __init__(self, font_dirs=None, cache_size=FONT_CACHE_SIZE):
+        if font_dirs is None:
+            font_dirs = [os.environ.get(FONT_DIR_ENV)] + fontconfig_dirs() + FONT_DIRS
+        self.font_dirs = [Path(d).expanduser() for d in font_dirs if d]
+        self.cache_size = cache_size
+        self.fonts = OrderedDict()
+        self.resolved = {}
+        self.fallbacks = set()
+        self.hits = 0
+        self.misses = 0
+        self._index = None
+
+    @property
+    def index(self):
+        """normalized face name -> font file, scanned on first use"""
+        if self._index is None:
+            self._index = {}
+            for directory in self.font_dirs:
+                if not directory.is_dir():
+                    continue
+                for root, _, files in os.walk(directory):
+                    for name in sorted(files):
+                        if name.lower().endswith(FONT_EXTENSIONS):
+                            self._index.setdefault(normalize_face(name),
+                                                   os.path.join(root, name))
+        return self._index
+
+    def find(self, *faces):
+        """Path of the first of faces that is installed, or None"""
+        if faces in self.resolved:
+            return self.resolved[faces]
+        path = None
+        for face in faces:
+            key = normalize_face(face)
+            path = self.index.get(key)
+            if path is None:
+                prefixed = sorted(name for name in self.index if name.startswith(key))
+                if prefixed:
+                    path = self.index[min(prefixed, key=len)]
+            if path:
+                break
+        self.resolved[faces] = path
+        return path
+
+    def font(self, size, *faces):
+        """FreeTypeFont for the first installed face (default: SANS_FACES)"""
+        faces = faces or SANS_FACES
+        path = self.find(*faces)
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is not None:
+            self.fonts.move_to_end(key)
+            self.hits += 1
+            return font
+
+        self.misses += 1
+        if path is not None:
+            font = ImageFont.truetype(path, size)
+        else:
+            if faces not in self.fallbacks:
+                self.fallbacks.add(faces)
+                print(f"⚠️  No font found for {', '.join(faces)}; using Pillow's default font "
+                      f"(set {FONT_DIR_ENV} to a folder of .ttf files)", file=sys.stderr)
+            font = ImageFont.load_default(size)
+        self.fonts[key] = font
+        while len(self.fonts) > self.cache_size:
+            self.fonts.popitem(last=False)
+        return font
+
+    def stats(self):
+        return {
+            'fonts_indexed': len(self.index),
+            'cached': len(self.fonts),
+            'hits': self.hits,
+            'misses': self.misses,
+            'fallbacks': sorted(', '.join(faces) for faces in self.fallbacks),
+        }
+
+
+# Shared by every generator in the process
+fonts = FontRegistry()
+
+
+def get_font(size, *faces):
+    """Cached font from the shared registry; see FontRegistry.font"""
+    return fonts.font(size, *faces)
@@ -4,19 +4,25 @@ Generate high-quality portfolio assets using Adobe Creative Cloud automation
 Elevates the portfolio with professional visuals
 """
 
+import argparse
 import os
 import json
 import subprocess
 from pathlib import Path
-from datetime import datetime
-import win32com.client if os.name == 'nt' else None  # For Windows Adobe automation
+
+try:
+    import win32com.client  # For Windows Adobe automation
+except ImportError:
+    win32com = None
+
+from card_scene import build_scene, color
 
 class AdobePortfolioAssetGenerator:
     """Generate professional portfolio assets using Adobe Creative Suite"""
     
-    def __init__(self):
-        self.output_dir = Path("/Users/matthewscott/Projects/OurJourney/adobe_assets")
-        self.output_dir.mkdir(exist_ok=True)
+    def __init__(self, output_dir=None):
+        self.output_dir = Path(output_dir or "/Users/matthewscott/Projects/OurJourney/adobe_assets")
+        self.output_dir.mkdir(parents=bool(output_dir), exist_ok=True)
         
         # Adobe color palette for consistency
         self.colors = {
@@ -68,58 +74,24 @@ class AdobePortfolioAssetGenerator:
             }
         }
         
+    def card_scene(self, project_key, project_data):
+        """Project visual scene: the 'photoshop' layout in card_scenes.json"""
+        context = {**self.colors, **project_data, 'key': project_key}
+        return build_scene('photoshop', f"{project_key}_visual", context)
+    
     def generate_photoshop_script(self, project_key, project_data):
         """Generate Adobe Photoshop JSX script for project visuals"""
+        scene = self.card_scene(project_key, project_data)
+        width, height = scene['size']
+        layers_jsx = "".join(self._layer_jsx(layer) for layer in scene['layers'])
         
         jsx_script = f"""
 // Adobe Photoshop Script - Project Visual for {project_data['title']}
 // Creates a professional project card with visual elements
 
 // Create new document
-var doc = app.documents.add(1920, 1080, 72, "{project_data['title']}_Visual", NewDocumentMode.RGB);
-
-// Set up gradient background
-var startColor = new SolidColor();
-startColor.rgb.hexValue = '{self.colors['gradient_start'].replace('#', '')}';
-var endColor = new SolidColor();
-endColor.rgb.hexValue = '{self.colors['gradient_end'].replace('#', '')}';
-
-// Create gradient layer
-var gradientLayer = doc.artLayers.add();
-gradientLayer.name = "Gradient Background";
-
-// Apply gradient
-var gradientFill = new GradientFill();
-gradientFill.angle = 135;
-gradientFill.type = GradientType.LINEAR;
-
-// Add title text
-var titleLayer = doc.artLayers.add();
-titleLayer.kind = LayerKind.TEXT;
-titleLayer.name = "{project_data['title']} Title";
-var textItem = titleLayer.textItem;
-textItem.contents = "{project_data['title']}";
-textItem.size = 72;
-textItem.font = "Inter-Bold";
-textItem.position = [100, 200];
-
-// Add subtitle
-var subtitleLayer = doc.artLayers.add();
-subtitleLayer.kind = LayerKind.TEXT;
-subtitleLayer.name = "Subtitle";
-var subtitleText = subtitleLayer.textItem;
-subtitleText.contents = "{project_data['subtitle']}";
-subtitleText.size = 36;
-subtitleText.font = "Inter-Regular";
-subtitleText.position = [100, 280];
-
-// Visual theme specific elements
-{self._get_visual_theme_jsx(project_data['visual_theme'])}
-
-// Add technology badges
-var techY = 900;
-{self._generate_tech_badges_jsx(project_data['tech'])}
-
+var doc = app.documents.add({width}, {height}, 72, "{project_data['title']}_Visual", NewDocumentMode.RGB);
+{layers_jsx}
 // Save as PNG
 var saveOptions = new PNGSaveOptions();
 saveOptions.compression = 0;
@@ -144,8 +116,72 @@ doc.close(SaveOptions.DONOTSAVECHANGES);
         print(f"✅ Generated Photoshop script: {script_path}")
         return script_path
     
-    def _get_visual_theme_jsx(self, theme):
-        """Generate theme-specific visual elements"""
+    def _layer_jsx(self, layer):
+        """Generate JSX for one scene layer"""
+        if layer['type'] == 'gradient':
+            start, end = ('%02X%02X%02X' % color(stop)[:3] for stop in (layer['stops'][0], layer['stops'][-1]))
+            return f"""
+// Set up gradient background
+var startColor = new SolidColor();
+startColor.rgb.hexValue = '{start}';
+var endColor = new SolidColor();
+endColor.rgb.hexValue = '{end}';
+
+// Create gradient layer
+var gradientLayer = doc.artLayers.add();
+gradientLayer.name = "Gradient Background";
+
+// Apply gradient
+var gradientFill = new GradientFill();
+gradientFill.angle = {layer.get('angle', 180)};
+gradientFill.type = GradientType.LINEAR;
+"""
+        if layer['type'] == 'text':
+            name = layer.get('id', 'text')
+            x, y = layer['position']
+            return f"""
+// Add {name}
+var {name}Layer = doc.artLayers.add();
+{name}Layer.kind = LayerKind.TEXT;
+{name}Layer.name = "{layer.get('name', name)}";
+var {name}Text = {name}Layer.textItem;
+{name}Text.contents = "{layer['text']}";
+{name}Text.size = {layer['size']};
+{name}Text.font = "{layer.get('font', 'Inter-Regular')}";
+{name}Text.position = [{x}, {y}];
+"""
+        if layer['type'] == 'visual':
+            return f"""
+// Visual theme specific elements
+{self._get_visual_theme_jsx(layer['theme'], layer['placements'].get(layer['theme']))}
+"""
+        if layer['type'] == 'badges':
+            x, y = layer['origin']
+            return f"""
+// Add technology badges
+var techY = {y};
+{self._generate_tech_badges_jsx(layer['items'], x, layer.get('step', 150), layer['size'])}
+"""
+        return f"\n// {layer['type']} layer: no Photoshop equivalent\n"
+    
+    def _get_visual_theme_jsx(self, theme, placement):
+        """Generate theme-specific visual elements inside their placement"""
+        if not placement:
+            return "// Default visual theme"
+        placement_jsx = f"""
+// Placement of the visual elements
+var themeColor = new SolidColor();
+themeColor.rgb.hexValue = '{'%02X%02X%02X' % color(placement['color'])[:3]}';
+"""
+        if 'box' in placement:
+            x, y, w, h = placement['box']
+            placement_jsx += f"var boxX = {x};\nvar boxY = {y};\nvar boxW = {w};\nvar boxH = {h};\n"
+        if 'center' in placement:
+            x, y = placement['center']
+            placement_jsx += f"var centerX = {x};\nvar centerY = {y};\n"
+        for key in ('radius', 'size'):
+            if key in placement:
+                placement_jsx += f"var {key} = {placement[key]};\n"
         
         themes = {
             'neural_network': """
@@ -156,13 +192,13 @@ networkLayer.name = "Neural Network";
 // Draw interconnected nodes
 for (var i = 0; i < 8; i++) {
     for (var j = 0; j < 5; j++) {
-        var x = 800 + (i * 120);
-        var y = 300 + (j * 120);
+        var x = boxX + (i * boxW / 8);
+        var y = boxY + (j * boxH / 5);
         
         // Create node
         var node = doc.pathItems.ellipse(y, x, 40, 40);
         node.filled = true;
-        node.fillColor = startColor;
+        node.fillColor = themeColor;
         node.stroked = true;
         node.strokeWidth = 2;
     }
@@ -174,24 +210,25 @@ var hubLayer = doc.artLayers.add();
 hubLayer.name = "Network Hub";
 
 // Central hub
-var centerX = 960;
-var centerY = 540;
-var hubSize = 100;
+var hubSize = radius / 3;
 
 // Draw central hub
 var hub = doc.pathItems.ellipse(centerY - hubSize/2, centerX - hubSize/2, hubSize, hubSize);
+hub.filled = true;
+hub.fillColor = themeColor;
 
 // Draw spokes
 for (var angle = 0; angle < 360; angle += 30) {
     var radians = angle * Math.PI / 180;
-    var endX = centerX + Math.cos(radians) * 300;
-    var endY = centerY + Math.sin(radians) * 300;
+    var endX = centerX + Math.cos(radians) * radius;
+    var endY = centerY + Math.sin(radians) * radius;
     
     // Create line from center to endpoint
     var spoke = doc.pathItems.add();
     spoke.setEntirePath([[centerX, centerY], [endX, endY]]);
     spoke.stroked = true;
     spoke.strokeWidth = 2;
+    spoke.strokeColor = themeColor;
 }
 """,
             'security_matrix': """
@@ -200,10 +237,11 @@ var matrixLayer = doc.artLayers.add();
 matrixLayer.name = "Security Matrix";
 
 // Create grid of security elements
+var cell = size / 4;
 for (var row = 0; row < 10; row++) {
     for (var col = 0; col < 15; col++) {
-        var x = 700 + (col * 50);
-        var y = 200 + (row * 50);
+        var x = centerX - (7.5 * cell) + (col * cell);
+        var y = centerY - (5 * cell) + (row * cell);
         
         // Random binary text
         var binaryLayer = doc.artLayers.add();
@@ -212,7 +250,7 @@ for (var row = 0; row < 10; row++) {
         binaryText.contents = Math.random() > 0.5 ? "1" : "0";
         binaryText.size = 20;
         binaryText.position = [x, y];
-        binaryText.color = endColor;
+        binaryText.color = themeColor;
     }
 }
 """,
@@ -222,14 +260,18 @@ var flowLayer = doc.artLayers.add();
 flowLayer.name = "Document Flow";
 
 // Create flowing documents
-for (var i = 0; i < 5; i++) {
-    var docX = 700 + (i * 150);
-    var docY = 400 + (Math.sin(i) * 100);
+var docCount = 5;
+var docW = boxW / (docCount + 2);
+var docH = docW * 1.4;
+var docStep = (boxW - docW) / (docCount - 1);
+for (var i = 0; i < docCount; i++) {
+    var docX = boxX + (i * docStep);
+    var docY = boxY + (boxH - docH) / 2 + (Math.sin(i) * (boxH - docH) / 2);
     
     // Document rectangle
-    var docRect = doc.pathItems.rectangle(docY, docX, 100, 140);
+    var docRect = doc.pathItems.rectangle(docY, docX, docW, docH);
     docRect.filled = true;
-    docRect.fillColor = startColor;
+    docRect.fillColor = themeColor;
     docRect.opacity = 80 - (i * 10);
 }
 """,
@@ -241,8 +283,8 @@ waveLayer.name = "Sound Waves";
 // Draw waveform
 var wavePoints = [];
 for (var x = 0; x < 50; x++) {
-    var xPos = 700 + (x * 20);
-    var yPos = 540 + (Math.sin(x * 0.5) * 100);
+    var xPos = boxX + (x * boxW / 49);
+    var yPos = boxY + boxH / 2 + (Math.sin(x * 0.5) * boxH / 2);
     wavePoints.push([xPos, yPos]);
 }
 
@@ -250,13 +292,13 @@ var wave = doc.pathItems.add();
 wave.setEntirePath(wavePoints);
 wave.stroked = true;
 wave.strokeWidth = 3;
-wave.strokeColor = endColor;
+wave.strokeColor = themeColor;
 """
         }
         
-        return themes.get(theme, "// Default visual theme")
+        return placement_jsx + themes.get(theme, "// Default visual theme")
     
-    def _generate_tech_badges_jsx(self, tech_stack):
+    def _generate_tech_badges_jsx(self, tech_stack, x=100, step=150, size=18):
         """Generate JSX for technology badges"""
         jsx = ""
         for i, tech in enumerate(tech_stack):
@@ -265,8 +307,8 @@ var techBadge{i} = doc.artLayers.add();
 techBadge{i}.kind = LayerKind.TEXT;
 var techText{i} = techBadge{i}.textItem;
 techText{i}.contents = "{tech}";
-techText{i}.size = 18;
-techText{i}.position = [{100 + (i * 150)}, techY];
+techText{i}.size = {size};
+techText{i}.position = [{x + (i * step)}, techY];
 """
         return jsx
     
@@ -706,5 +748,8 @@ if __name__ == "__main__":
         return self.output_dir
 
 if __name__ == "__main__":
-    generator = AdobePortfolioAssetGenerator()
+    parser = argparse.ArgumentParser(description="Generate Adobe Creative Cloud asset scripts")
+    parser.add_argument('--output-dir', help="write the scripts here instead of the default folder")
+    args = parser.parse_args()
+    generator = AdobePortfolioAssetGenerator(args.output_dir)
     generator.generate_all_assets()
\ No newline at end of file
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Memoized image layers shared by the asset generators
+Backgrounds and panels that several assets have in common are built once
+per batch, kept in an LRU bounded by pixel bytes and handed out as copies
+"""
+
+from collections import OrderedDict
+
+# Enough for a few dozen full-HD RGBA layers
+LAYER_CACHE_BYTES = 256 * 2 ** 20
+
+
+def image_bytes(img):
+    return img.width * img.height * len(img.getbands())
+
+
+class LayerCache:
+    """Build each (layer type, size, parameters) image once, hand out copies
+
+    Entries are evicted least recently used first once their pixel data
+    exceeds max_bytes; a layer larger than the whole budget is built and
+    returned but never stored. Callers always get a copy, so drawing on
+    the result never touches the cached layer.
+    """
+
+    def __init__(self, max_bytes=LAYER_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.layers = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind, size, params, build):
+        """Copy of the cached layer, calling build() to make it on a miss
+
+        params must be hashable; build takes no arguments and returns a
+        PIL image of `size`.
+        """
+        key = (kind, tuple(size), params)
+        layer = self.layers.get(key)
+        if layer is not None:
+            self.layers.move_to_end(key)
+            self.hits += 1
+            return layer.copy()
+
+        self.misses += 1
+        layer = build()
+        cost = image_bytes(layer)
+        if cost <= self.max_bytes:
+            self.layers[key] = layer
+            self.bytes += cost
+            while self.bytes > self.max_bytes:
+                _, evicted = self.layers.popitem(last=False)
+                self.bytes -= image_bytes(evicted)
+        return layer.copy()
+
+    def clear(self):
+        self.layers.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            'layers': len(self.layers),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+# Shared by every generator in the process
+layers = LayerCache()
@@ -1,24 +1,1904 @@
 #!/usr/bin/env python3
 """Simple server for testing the portfolio locally"""
 
+import argparse
+import asyncio
+import bisect
+import collections
+import concurrent.futures
+import ctypes
+import ctypes.util
+import contextlib
+import datetime
+import email.utils
+import functools
+import hashlib
+import html.parser
 import http.server
+import io
+import json
+import queue
+import re
+import select
+import signal
+import socket
 import socketserver
+import stat
+import struct
+import sys
+import threading
+import time
+import traceback
+import urllib.parse
+import uuid
 import webbrowser
 import os
 
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
 PORT = 8080
 DIRECTORY = os.path.dirname(os.path.abspath(__file__))
 
+# Concurrency defaults
+WORKERS = 8
+QUEUE_SIZE = 64
+KEEPALIVE_TIMEOUT = 5.0     # seconds an idle HTTP/1.1 connection keeps its worker
+BACKENDS = ('serial', 'threads', 'asyncio')
+
+# Pre-fork supervisor
+PREFORK_GRACE = 10.0        # seconds workers get to drain on shutdown
+PREFORK_MIN_UPTIME = 1.0    # exits sooner than this count as crash loops
+PREFORK_MAX_BACKOFF = 30.0
+PREFORK_BACKLOG = 128       # listen backlog of each worker's socket
+REUSEPORT = hasattr(socket, 'SO_REUSEPORT')
+PREFORK_POLL = 0.05         # reap interval while a restart is backing off
+
+# Hot-file cache defaults
+CACHE_SIZE = 32 * 1024 * 1024      # total bytes held in memory
+CACHE_MAX_FILE = 4 * 1024 * 1024   # larger files always stream from disk
+CACHE_REVALIDATE = 1.0             # seconds an entry is trusted before re-stat
+
+# Range / zero-copy transfer
+MAX_RANGES = 16
+COPY_BUFSIZE = 64 * 1024
+SENDFILE = hasattr(os, 'sendfile')
+
+# Metrics and access logging
+METRICS_PATH = '/__metrics'
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+MAX_ROUTES = 200                   # further distinct paths are reported as "other"
+ACCESS_LOG_BUFFER = 10000          # records held before new ones are dropped
+
+# File watching and live reload
+WATCH_MODES = ('auto', 'inotify', 'poll', 'off')
+POLL_INTERVAL = 1.0                # seconds between polling-watcher scans
+WATCH_DEBOUNCE = 0.05              # coalesce bursts of events within this window
+LIVE_RELOAD_PATH = '/__livereload'
+LIVE_RELOAD_PING = 15.0            # keepalive comment interval for SSE clients
+
+# Production header/rewrite emulation
+PLATFORMS = ('netlify', 'render', 'off')
+
+# Preload hints
+PRELOAD_MAX_IMAGES = 2             # eager <img> tags worth preloading per page
+
+# Cache-Control rules: first URL path regex that matches wins
+CACHE_POLICY = [
+    (r'\.[0-9a-f]{8,}\.[A-Za-z0-9]+$', 'public, max-age=31536000, immutable'),
+    (r'(^/$|\.html?$)', 'no-cache'),
+    (r'.*', 'public, max-age=0, must-revalidate'),
+]
+
+
+CachedFile = collections.namedtuple(
+    'CachedFile', ['data', 'size', 'mtime', 'content_type', 'validated_at'])
+
+
+class FileCache:
+    """In-memory LRU cache of small static files
+
+    Entries are keyed by filesystem path and invalidated when the file's
+    mtime or size changes. A hit inside the revalidation window is served
+    straight from memory without any filesystem call.
+    """
+
+    def __init__(self, max_bytes=CACHE_SIZE, max_file_size=CACHE_MAX_FILE,
+                 revalidate=CACHE_REVALIDATE):
+        self.max_bytes = max_bytes
+        self.max_file_size = min(max_file_size, max_bytes)
+        self.revalidate = revalidate
+        self.entries = collections.OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, path, content_type):
+        """Return (entry, hit) for path
+
+        entry is None when the file should stream from disk instead (not a
+        regular file, or larger than max_file_size). Raises OSError if the
+        file cannot be stat'ed or read.
+        """
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and now - entry.validated_at < self.revalidate:
+                self.entries.move_to_end(path)
+                self.hits += 1
+                return entry, True
+
+        st = os.stat(path)
+        if not stat.S_ISREG(st.st_mode):
+            return None, False
+        if entry is not None and (entry.mtime, entry.size) == (st.st_mtime, st.st_size):
+            with self.lock:
+                if path in self.entries:
+                    entry = entry._replace(validated_at=now)
+                    self.entries[path] = entry
+                    self.entries.move_to_end(path)
+                self.hits += 1
+            return entry, True
+
+        with self.lock:
+            self.misses += 1
+        if st.st_size > self.max_file_size:
+            self.invalidate(path)
+            return None, False
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        entry = CachedFile(data, len(data), st.st_mtime, content_type, now)
+        self._store(path, entry)
+        return entry, False
+
+    def _store(self, path, entry):
+        with self.lock:
+            old = self.entries.pop(path, None)
+            if old is not None:
+                self.bytes -= old.size
+            self.entries[path] = entry
+            self.bytes += entry.size
+            while self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= evicted.size
+                self.evictions += 1
+
+    def __contains__(self, path):
+        with self.lock:
+            return path in self.entries
+
+    def invalidate(self, path):
+        with self.lock:
+            old = self.entries.pop(path, None)
+            if old is not None:
+                self.bytes -= old.size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+
+FileMeta = collections.namedtuple('FileMeta', ['etag', 'content_hash', 'size', 'mtime'])
+
+
+class MetadataIndex:
+    """Content hash, size and mtime for every file under the served directory
+
+    Strong ETags are derived from a SHA-256 of the file contents. An entry is
+    reused for as long as the caller reports the same (size, mtime), so a
+    file is hashed once per change rather than once per request.
+    """
+
+    def __init__(self, root=DIRECTORY):
+        self.root = root
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def scan(self):
+        """Hash every file under root up front; returns the number indexed"""
+        count = 0
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                    self.get(path, st.st_size, st.st_mtime)
+                except OSError:
+                    continue
+                count += 1
+        return count
+
+    def get(self, path, size, mtime, data=None):
+        """Return FileMeta for path, hashing data (or the file) when stale"""
+        with self.lock:
+            meta = self.entries.get(path)
+        if meta is not None and (meta.size, meta.mtime) == (size, mtime):
+            return meta
+
+        digest = hashlib.sha256()
+        if data is not None:
+            digest.update(data)
+        else:
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        content_hash = digest.hexdigest()
+        meta = FileMeta(f'"{content_hash[:32]}"', content_hash, size, mtime)
+        with self.lock:
+            self.entries[path] = meta
+        return meta
+
+    def invalidate(self, path):
+        with self.lock:
+            self.entries.pop(path, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class CachePolicy:
+    """Cache-Control values chosen by the first matching URL path regex"""
+
+    def __init__(self, rules=CACHE_POLICY):
+        self.rules = [(re.compile(pattern), value) for pattern, value in rules]
+
+    @classmethod
+    def from_file(cls, path):
+        """Load rules from a JSON list of {"pattern": ..., "cache_control": ...}"""
+        with open(path) as f:
+            rules = json.load(f)
+        return cls([(rule['pattern'], rule['cache_control']) for rule in rules])
+
+    def lookup(self, url_path):
+        for pattern, value in self.rules:
+            if pattern.search(url_path):
+                return value
+        return None
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with interpolated quantiles"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Estimate the q-quantile by linear interpolation inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+        return self.buckets[-1]
+
+
+class Metrics:
+    """Request counters rendered in the Prometheus text format
+
+    Each server process keeps its own numbers; with --processes every
+    worker reports only the requests it handled.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.bytes_sent = collections.Counter()
+        self.statuses = collections.Counter()
+        self.cache_results = collections.Counter()
+        self.in_flight = 0
+
+    def route(self, path):
+        with self.lock:
+            if path in self.latency or len(self.latency) < MAX_ROUTES:
+                return path
+        return 'other'
+
+    def begin(self):
+        with self.lock:
+            self.in_flight += 1
+
+    def end(self, route, status, nbytes, duration, cache_status=None):
+        with self.lock:
+            self.in_flight -= 1
+            histogram = self.latency.get(route)
+            if histogram is None:
+                histogram = self.latency[route] = Histogram()
+            histogram.observe(duration)
+            self.bytes_sent[route] += nbytes
+            self.statuses[status] += 1
+            if cache_status:
+                self.cache_results[cache_status] += 1
+
+    def render(self, file_cache=None, access_log=None):
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self.lock:
+            family('portfolio_http_requests_in_flight', 'gauge',
+                   "Requests currently being handled")
+            lines.append(f"portfolio_http_requests_in_flight {self.in_flight}")
+
+            family('portfolio_http_request_duration_seconds', 'histogram',
+                   "Request latency by route")
+            for route, histogram in sorted(self.latency.items()):
+                label = f'route="{_escape_label(route)}"'
+                cumulative = 0
+                bounds = [repr(bound) for bound in histogram.buckets] + ['+Inf']
+                for bound, n in zip(bounds, histogram.counts):
+                    cumulative += n
+                    lines.append(f'portfolio_http_request_duration_seconds_bucket'
+                                 f'{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f"portfolio_http_request_duration_seconds_sum{{{label}}} "
+                             f"{histogram.sum:.6f}")
+                lines.append(f"portfolio_http_request_duration_seconds_count{{{label}}} "
+                             f"{histogram.count}")
+
+            family('portfolio_http_request_duration_quantile_seconds', 'gauge',
+                   "Latency quantiles by route, estimated from the histogram")
+            for route, histogram in sorted(self.latency.items()):
+                for q in LATENCY_QUANTILES:
+                    lines.append(f'portfolio_http_request_duration_quantile_seconds'
+                                 f'{{route="{_escape_label(route)}",quantile="{q}"}} '
+                                 f'{histogram.quantile(q):.6f}')
+
+            family('portfolio_http_response_bytes_total', 'counter',
+                   "Response bytes written (headers and body) by route")
+            for route, nbytes in sorted(self.bytes_sent.items()):
+                lines.append(f'portfolio_http_response_bytes_total'
+                             f'{{route="{_escape_label(route)}"}} {nbytes}')
+
+            family('portfolio_http_responses_total', 'counter', "Responses by status code")
+            for status, n in sorted(self.statuses.items()):
+                lines.append(f'portfolio_http_responses_total{{code="{status}"}} {n}')
+
+            family('portfolio_http_cache_results_total', 'counter',
+                   "Responses by X-Cache result")
+            for result, n in sorted(self.cache_results.items()):
+                lines.append(f'portfolio_http_cache_results_total{{result="{result}"}} {n}')
+
+        if file_cache is not None:
+            stats = file_cache.stats()
+            family('portfolio_file_cache_hits_total', 'counter', "File cache hits")
+            lines.append(f"portfolio_file_cache_hits_total {stats['hits']}")
+            family('portfolio_file_cache_misses_total', 'counter', "File cache misses")
+            lines.append(f"portfolio_file_cache_misses_total {stats['misses']}")
+            family('portfolio_file_cache_hit_ratio', 'gauge', "File cache hits / lookups")
+            lines.append(f"portfolio_file_cache_hit_ratio {stats['hit_ratio']:.6f}")
+            family('portfolio_file_cache_evictions_total', 'counter', "File cache LRU evictions")
+            lines.append(f"portfolio_file_cache_evictions_total {stats['evictions']}")
+            family('portfolio_file_cache_bytes', 'gauge', "Bytes held by the file cache")
+            lines.append(f"portfolio_file_cache_bytes {stats['bytes']}")
+
+        if access_log is not None:
+            family('portfolio_access_log_dropped_total', 'counter',
+                   "Access log records dropped because the buffer was full")
+            lines.append(f"portfolio_access_log_dropped_total {access_log.dropped}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class AccessLog:
+    """Buffered JSON-lines access log written by a background thread
+
+    Request threads only enqueue a record; if the writer falls behind and
+    the buffer fills up, records are dropped (and counted) rather than
+    blocking the response.
+    """
+
+    def __init__(self, stream=None, buffer_size=ACCESS_LOG_BUFFER):
+        self.stream = stream if stream is not None else sys.stderr
+        self.records = queue.Queue(maxsize=buffer_size)
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name="access-log", daemon=True)
+        self.thread.start()
+
+    def log(self, record):
+        try:
+            self.records.put_nowait(record)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+
+    def _run(self):
+        while True:
+            batch = [self.records.get()]
+            while len(batch) < 256:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            lines = [json.dumps(record, separators=(',', ':')) for record in batch
+                     if record is not None]
+            if lines:
+                try:
+                    self.stream.write("\n".join(lines) + "\n")
+                    self.stream.flush()
+                except (OSError, ValueError):
+                    pass
+            if stop:
+                break
+
+    def close(self):
+        self.records.put(None)
+        self.thread.join(timeout=5)
+
+
+class CountingWriter:
+    """Wrap a handler's wfile and count the bytes written through it"""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.count = 0
+
+    def write(self, data):
+        self.raw.write(data)
+        self.count += len(data)
+        return len(data)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+# Injected before </body> of HTML responses when live reload is on
+LIVE_RELOAD_SNIPPET = b"""<script>
+(function () {
+  var source = new EventSource('/__livereload');
+  function bust(url) {
+    var u = new URL(url, location.href);
+    u.searchParams.set('livereload', Date.now());
+    return u.href;
+  }
+  function refresh(elements, attr, path) {
+    var found = false;
+    elements.forEach(function (el) {
+      if (el[attr] && new URL(el[attr], location.href).pathname === path) {
+        el[attr] = bust(el[attr]);
+        found = true;
+      }
+    });
+    return found;
+  }
+  source.addEventListener('change', function (event) {
+    var path = JSON.parse(event.data).path;
+    var sheets = document.querySelectorAll('link[rel="stylesheet"]');
+    if (/\\.css$/.test(path)) {
+      refresh(sheets, 'href', path);
+    } else if (/\\.(png|jpe?g|gif|svg|webp|avif|ico)$/.test(path)) {
+      var found = refresh(document.querySelectorAll('img'), 'src', path);
+      found = refresh(document.querySelectorAll('link[rel~="icon"]'), 'href', path) || found;
+      // Not referenced directly: it may be a CSS background, so re-fetch the sheets
+      if (!found) { sheets.forEach(function (s) { s.href = bust(s.href); }); }
+    } else if (path === '*' || /(\\.html?|\\.js|\\/)$/.test(path)) {
+      location.reload();
+    }
+  });
+})();
+</script>
+"""
+
+
+def inject_live_reload(html):
+    """Insert LIVE_RELOAD_SNIPPET before the closing body tag"""
+    at = html.lower().rfind(b'</body>')
+    if at < 0:
+        return html + LIVE_RELOAD_SNIPPET
+    return html[:at] + LIVE_RELOAD_SNIPPET + html[at:]
+
+
+class LiveReloadHub:
+    """Push file-change events to Server-Sent Events clients
+
+    Event-stream sockets are handed over by the request handler, so an open
+    browser tab doesn't tie up a worker. A slow or dead client is dropped
+    the first time a write to it fails or times out.
+    """
+
+    def __init__(self, ping_interval=LIVE_RELOAD_PING):
+        self.clients = set()
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._ping, args=(ping_interval,),
+                                       name="live-reload", daemon=True)
+        self.thread.start()
+
+    def attach(self, sock):
+        sock.settimeout(1.0)
+        with self.lock:
+            self.clients.add(sock)
+
+    def broadcast(self, url_path):
+        self._send(f"event: change\ndata: {json.dumps({'path': url_path})}\n\n".encode())
+
+    def _send(self, payload):
+        with self.lock:
+            clients = list(self.clients)
+        for sock in clients:
+            try:
+                sock.sendall(payload)
+            except OSError:
+                with self.lock:
+                    self.clients.discard(sock)
+                sock.close()
+
+    def _ping(self, interval):
+        while not self.stopped.wait(interval):
+            self._send(b": ping\n\n")
+
+    def close(self):
+        self.stopped.set()
+        with self.lock:
+            clients, self.clients = self.clients, set()
+        for sock in clients:
+            sock.close()
+
+
+class InotifyWatcher:
+    """Recursive inotify watch of a directory tree (Linux only)
+
+    callback receives a set of changed file paths, or None when the kernel
+    queue overflowed or a directory moved and everything must be assumed
+    stale.
+    """
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ISDIR = 0x40000000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, root, callback):
+        self.root = root
+        self.callback = callback
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = self.libc.inotify_init1(self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.wake_r, self.wake_w = os.pipe()
+        for dirpath, dirnames, _ in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not _ignored_name(d)]
+            self._add_watch(dirpath)
+        self.thread = threading.Thread(target=self._run, name="inotify", daemon=True)
+
+    @staticmethod
+    def available():
+        return sys.platform.startswith('linux') and ctypes.util.find_library('c') is not None
+
+    def _add_watch(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd >= 0:
+            self.watches[wd] = path
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            ready, _, _ = select.select([self.fd, self.wake_r], [], [])
+            if self.wake_r in ready:
+                break
+            changed = set()
+            # Keep reading until the burst settles so one save is one event
+            while ready:
+                changed = self._read(changed)
+                ready, _, _ = select.select([self.fd], [], [], WATCH_DEBOUNCE)
+            if changed is None or changed:
+                self.callback(changed)
+
+    def _read(self, changed):
+        """Parse queued events into changed; returns None on overflow"""
+        buf = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, length = self.EVENT.unpack_from(buf, offset)
+            offset += self.EVENT.size
+            name = os.fsdecode(buf[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                changed = None
+                continue
+            if mask & self.IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            directory = self.watches.get(wd)
+            if directory is None or not name or _ignored_name(name):
+                continue
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._add_watch(path)
+                if mask & (self.IN_MOVED_FROM | self.IN_MOVED_TO | self.IN_DELETE):
+                    changed = None
+            elif changed is not None:
+                changed.add(path)
+        return changed
+
+    def stop(self):
+        os.write(self.wake_w, b'x')
+        if self.thread.is_alive():
+            self.thread.join(timeout=5)
+        for fd in (self.fd, self.wake_r, self.wake_w):
+            os.close(fd)
+
+
+class PollingWatcher:
+    """Portable fallback: rescan the tree every POLL_INTERVAL seconds"""
+
+    def __init__(self, root, callback, interval=POLL_INTERVAL):
+        self.root = root
+        self.callback = callback
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.snapshot = self._scan()
+        self.thread = threading.Thread(target=self._run, name="poll-watcher", daemon=True)
+
+    def _scan(self):
+        snapshot = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not _ignored_name(d)]
+            for name in filenames:
+                if _ignored_name(name):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed:
+                self.callback(changed)
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread.is_alive():
+            self.thread.join(timeout=5)
+
+
+def _ignored_name(name):
+    return name.startswith('.') or name == '__pycache__' or name.endswith('~')
+
+
+def make_watcher(mode, root, callback):
+    """Return an unstarted watcher for mode ('auto' prefers inotify)"""
+    if mode in ('auto', 'inotify') and InotifyWatcher.available():
+        try:
+            return InotifyWatcher(root, callback)
+        except OSError:
+            if mode == 'inotify':
+                raise
+    elif mode == 'inotify':
+        raise OSError("inotify is not available on this platform")
+    return PollingWatcher(root, callback)
+
+
+HeaderRule = collections.namedtuple('HeaderRule', ['headers'])
+RedirectRule = collections.namedtuple('RedirectRule', ['target', 'status', 'force'])
+
+
+class PathTrie:
+    """Segment trie for deploy-config path patterns
+
+    Supports exact paths (/resume.pdf), trailing splats (/assets/*) and
+    :placeholder segments (/blog/:slug). match() returns every rule whose
+    pattern matches, in insertion order, with the captured parameters.
+    """
+
+    def __init__(self):
+        self.root = self._node()
+        self.size = 0
+
+    @staticmethod
+    def _node():
+        return {'children': {}, 'param': None, 'exact': [], 'splat': []}
+
+    def insert(self, pattern, value):
+        order = self.size
+        self.size += 1
+        segments = [segment for segment in pattern.split('/') if segment]
+        names = []
+        node = self.root
+        for i, segment in enumerate(segments):
+            if segment == '*' and i == len(segments) - 1:
+                node['splat'].append((order, value, names))
+                return
+            if segment.startswith(':'):
+                names.append(segment[1:])
+                if node['param'] is None:
+                    node['param'] = self._node()
+                node = node['param']
+            else:
+                node = node['children'].setdefault(segment, self._node())
+        node['exact'].append((order, value, names))
+
+    def match(self, path):
+        segments = [segment for segment in path.split('/') if segment]
+        found = []
+
+        def walk(node, depth, captured):
+            for order, value, names in node['splat']:
+                params = dict(zip(names, captured))
+                params['splat'] = '/'.join(segments[depth:])
+                found.append((order, value, params))
+            if depth == len(segments):
+                for order, value, names in node['exact']:
+                    found.append((order, value, dict(zip(names, captured))))
+                return
+            child = node['children'].get(segments[depth])
+            if child is not None:
+                walk(child, depth + 1, captured)
+            if node['param'] is not None:
+                walk(node['param'], depth + 1, captured + [segments[depth]])
+
+        walk(self.root, 0, [])
+        found.sort(key=lambda item: item[0])
+        return [(value, params) for _, value, params in found]
+
+
+class PlatformRules:
+    """Header and redirect/rewrite rules compiled from a deploy config"""
+
+    def __init__(self, source):
+        self.source = source
+        self.header_rules = PathTrie()
+        self.redirect_rules = PathTrie()
+
+    def add_headers(self, pattern, headers):
+        self.header_rules.insert(pattern, HeaderRule(list(headers)))
+
+    def add_redirect(self, pattern, target, status=301, force=False):
+        self.redirect_rules.insert(pattern, RedirectRule(target, int(status), bool(force)))
+
+    def headers_for(self, path):
+        """Headers for path; later rules override earlier ones with the same name"""
+        merged = {}
+        for rule, _ in self.header_rules.match(path):
+            for name, value in rule.headers:
+                merged[name.lower()] = (name, value)
+        return list(merged.values())
+
+    def redirects_for(self, path):
+        return self.redirect_rules.match(path)
+
+    @staticmethod
+    def expand(target, params):
+        """Substitute :splat and :placeholder values into a rule target"""
+        for name, value in sorted(params.items(), key=lambda item: -len(item[0])):
+            target = target.replace(f':{name}', value)
+        return target
+
+    def describe(self):
+        return (f"{self.source}: {self.header_rules.size} header rules, "
+                f"{self.redirect_rules.size} redirects/rewrites")
+
+
+def load_netlify_rules(path):
+    """Compile [[headers]] and [[redirects]] from netlify.toml"""
+    if tomllib is None:
+        raise RuntimeError("reading netlify.toml needs Python 3.11+ or `pip install tomli`")
+    with open(path, 'rb') as f:
+        config = tomllib.load(f)
+    rules = PlatformRules(os.path.basename(path))
+    for block in config.get('headers', []):
+        rules.add_headers(block['for'], block.get('values', {}).items())
+    for block in config.get('redirects', []):
+        rules.add_redirect(block['from'], block['to'], block.get('status', 301),
+                           block.get('force', False))
+    return rules
+
+
+def load_render_rules(path):
+    """Compile service headers and routes from render.yaml"""
+    if yaml is None:
+        raise RuntimeError("reading render.yaml needs `pip install pyyaml`")
+    with open(path) as f:
+        config = yaml.safe_load(f) or {}
+    rules = PlatformRules(os.path.basename(path))
+    for service in config.get('services', []):
+        for header in service.get('headers', []):
+            rules.add_headers(header['path'], [(header['name'], header['value'])])
+        for route in service.get('routes', []):
+            status = 200 if route.get('type') == 'rewrite' else 301
+            rules.add_redirect(route['source'], route['destination'], status)
+    return rules
+
+
+PLATFORM_LOADERS = {
+    'netlify': ('netlify.toml', load_netlify_rules),
+    'render': ('render.yaml', load_render_rules),
+}
+
+
+def load_platform_rules(platform, root=DIRECTORY):
+    filename, loader = PLATFORM_LOADERS[platform]
+    return loader(os.path.join(root, filename))
+
+
+class CriticalResourceParser(html.parser.HTMLParser):
+    """Collect the subresources a page needs for first paint, in document order"""
+
+    def __init__(self):
+        super().__init__()
+        self.resources = []    # (url, destination)
+        self.images = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link' and attrs.get('href'):
+            rel = (attrs.get('rel') or '').lower().split()
+            if 'stylesheet' in rel:
+                self.resources.append((attrs['href'], 'style'))
+            elif 'icon' in rel:
+                self.resources.append((attrs['href'], 'image'))
+        elif tag == 'script' and attrs.get('src'):
+            self.resources.append((attrs['src'], 'script'))
+        elif tag == 'img' and attrs.get('src') and attrs.get('loading') != 'lazy':
+            if self.images < PRELOAD_MAX_IMAGES:
+                self.resources.append((attrs['src'], 'image'))
+                self.images += 1
+
+
+class PreloadIndex:
+    """Link: rel=preload values for each HTML document, parsed once per version
+
+    Same-origin references that don't exist on disk are left out so a
+    preload never costs a wasted 404 (or SPA-fallback) fetch. Cross-origin
+    stylesheets also get a preconnect to their origin.
+    """
+
+    PRIORITY = {'style': 0, 'script': 1, 'image': 2}
+
+    def __init__(self, root=DIRECTORY):
+        self.root = root
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, path, size, mtime, data=None):
+        with self.lock:
+            cached = self.entries.get(path)
+        if cached is not None and cached[:2] == (size, mtime):
+            return cached[2]
+        if data is None:
+            with open(path, 'rb') as f:
+                data = f.read()
+        links = self.parse(path, data)
+        with self.lock:
+            self.entries[path] = (size, mtime, links)
+        return links
+
+    def parse(self, path, data):
+        parser = CriticalResourceParser()
+        parser.feed(data.decode('utf-8', errors='replace'))
+        base = '/' + os.path.relpath(path, self.root).replace(os.sep, '/')
+
+        preloads, origins, seen = [], [], set()
+        for url, destination in parser.resources:
+            parts = urllib.parse.urlsplit(urllib.parse.urljoin(base, url))
+            if parts.scheme in ('http', 'https') or parts.netloc:
+                origin = f"{parts.scheme or 'https'}://{parts.netloc}"
+                target = urllib.parse.urlunsplit(parts)
+                if origin not in origins:
+                    origins.append(origin)
+            elif parts.scheme:
+                continue    # data:, blob: and friends
+            else:
+                local = os.path.join(self.root, *parts.path.lstrip('/').split('/'))
+                if not os.path.isfile(local):
+                    continue
+                target = urllib.parse.urlunsplit(('', '', parts.path, parts.query, ''))
+            if target not in seen:
+                seen.add(target)
+                preloads.append((target, destination))
+
+        preloads.sort(key=lambda item: self.PRIORITY[item[1]])
+        links = [f"<{origin}>; rel=preconnect" for origin in origins]
+        links += [f"<{url}>; rel=preload; as={destination}" for url, destination in preloads]
+        return links
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def parse_range(header, size):
+    """Parse a Range header into sorted, merged (start, end) inclusive pairs
+
+    Returns None when the header should be ignored (malformed, not bytes,
+    too many ranges) and [] when no range is satisfiable.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or not spec:
+        return None
+    specs = spec.split(',')
+    if len(specs) > MAX_RANGES:
+        return None
+
+    ranges = []
+    for part in specs:
+        first, dash, last = part.strip().partition('-')
+        if not dash:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if last and end < start:
+                    return None
+            else:
+                suffix = int(last)
+                if suffix == 0:
+                    continue
+                start, end = max(size - suffix, 0), size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    ranges.sort()
+    merged = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def http_version(version):
+    """(major, minor) of an "HTTP/x.y" string, (0, 9) when it doesn't parse"""
+    try:
+        major, minor = version.removeprefix('HTTP/').split('.')
+        return int(major), int(minor)
+    except ValueError:
+        return (0, 9)
+
+
+def multipart_spans(ranges, size, ctype, boundary):
+    """(header bytes, offset, count) spans of a multipart/byteranges body"""
+    spans = []
+    for start, end in ranges:
+        head = (f"\r\n--{boundary}\r\n"
+                f"Content-Type: {ctype}\r\n"
+                f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n")
+        spans.append((head.encode('latin-1'), start, end - start + 1))
+    spans.append((f"\r\n--{boundary}--\r\n".encode('latin-1'), 0, 0))
+    return spans
+
+
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIRECTORY, **kwargs)
 
-print(f"🌐 Starting portfolio server on http://localhost:{PORT}")
-print("📁 Serving files from:", DIRECTORY)
-print("Press Ctrl+C to stop the server\n")
+    @property
+    def protocol_version(self):
+        """HTTP/1.1 when 103 Early Hints are on, the stock HTTP/1.0 otherwise
+
+        1xx interim responses only exist from HTTP/1.1 on. Every response
+        sends Content-Length or closes the connection, so the keep-alive
+        connections that come with HTTP/1.1 are safe.
+        """
+        if getattr(self.server, 'early_hints', False):
+            return "HTTP/1.1"
+        return "HTTP/1.0"
+
+    def setup(self):
+        super().setup()
+        if self.protocol_version >= "HTTP/1.1":
+            # Idle keep-alive connections must not hold a worker for good
+            self.connection.settimeout(KEEPALIVE_TIMEOUT)
+        self.wfile = CountingWriter(self.wfile)
+
+    rule_headers = ()
+
+    def do_GET(self):
+        with self.observe():
+            path = urllib.parse.urlsplit(self.path).path
+            if path == METRICS_PATH:
+                self.send_metrics()
+            elif path == LIVE_RELOAD_PATH:
+                self.send_event_stream()
+            elif not self.apply_platform_rules():
+                super().do_GET()
+
+    def do_HEAD(self):
+        with self.observe():
+            if not self.apply_platform_rules():
+                super().do_HEAD()
+
+    def apply_platform_rules(self):
+        """Emulate the deploy config's headers and redirects/rewrites
+
+        Rewrites (status 200) change self.path in place. Returns True when
+        a redirect response has already been sent.
+        """
+        rules = getattr(self.server, 'platform_rules', None)
+        if rules is None:
+            return False
+        parts = urllib.parse.urlsplit(self.path)
+        # Header rules match the URL the browser asked for, not the rewrite
+        self.rule_headers = rules.headers_for(parts.path)
+
+        for rule, params in rules.redirects_for(parts.path):
+            # Unforced rules are shadowed by any file that exists at the path
+            if not rule.force and self.path_exists(parts.path):
+                continue
+            target = rules.expand(rule.target, params)
+            if 300 <= rule.status < 400:
+                self.send_response(rule.status)
+                self.send_header("Location", target)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return True
+            if parts.query and '?' not in target:
+                target += '?' + parts.query
+            self.path = target
+            break
+        return False
+
+    def path_exists(self, url_path):
+        path = self.translate_path(url_path)
+        cache = getattr(self.server, 'file_cache', None)
+        if cache is not None and path in cache:
+            return True
+        return os.path.exists(path)
+
+    def end_headers(self):
+        for name, value in self.rule_headers:
+            self.send_header(name, value)
+        super().end_headers()
+
+    @contextlib.contextmanager
+    def observe(self):
+        """Record latency, status and bytes for one request"""
+        metrics = getattr(self.server, 'metrics', None)
+        access_log = getattr(self.server, 'access_log', None)
+        self.status_code = None
+        self.cache_status = None
+        self.rule_headers = ()
+        started = time.perf_counter()
+        # Platform rewrites change self.path; report what the client asked for
+        requested = self.path
+        bytes_before = self.wfile.count
+        if metrics is not None:
+            metrics.begin()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            nbytes = self.wfile.count - bytes_before
+            path = urllib.parse.urlsplit(requested).path
+            if metrics is not None:
+                metrics.end(metrics.route(path), self.status_code, nbytes,
+                            duration, self.cache_status)
+            if access_log is not None:
+                access_log.log({
+                    'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    'client': self.client_address[0],
+                    'method': self.command,
+                    'path': requested,
+                    'status': self.status_code,
+                    'bytes': nbytes,
+                    'duration_ms': round(duration * 1000, 3),
+                    'cache': self.cache_status,
+                    'user_agent': self.headers.get('User-Agent'),
+                })
+
+    def send_metrics(self):
+        metrics = getattr(self.server, 'metrics', None)
+        if metrics is None:
+            self.send_error(http.server.HTTPStatus.NOT_FOUND, "Metrics are disabled")
+            return
+        body = metrics.render(getattr(self.server, 'file_cache', None),
+                              getattr(self.server, 'access_log', None)).encode()
+        self.send_response(http.server.HTTPStatus.OK)
+        self.send_header("Content-type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_event_stream(self):
+        """Open a Server-Sent Events stream and hand the socket to the hub"""
+        hub = getattr(self.server, 'live_reload', None)
+        if hub is None:
+            self.send_error(http.server.HTTPStatus.NOT_FOUND, "Live reload is disabled")
+            return
+        self.send_response(http.server.HTTPStatus.OK)
+        self.send_header("Content-type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(b"retry: 1000\n\n")
+        self.close_connection = True
+        # detach() leaves the server's shutdown_request/close with a dead
+        # socket object, so the hub becomes the only owner of the connection
+        hub.attach(socket.socket(fileno=self.connection.detach()))
+
+    def log_request(self, code='-', size='-'):
+        # Per-request records are written by observe() once the body is sent
+        self.status_code = int(code) if isinstance(code, int) else code
+        if getattr(self.server, 'access_log', None) is None:
+            super().log_request(code, size)
+
+    def log_message(self, format, *args):
+        access_log = getattr(self.server, 'access_log', None)
+        if access_log is None:
+            return super().log_message(format, *args)
+        access_log.log({
+            'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'client': self.address_string(),
+            'message': format % args,
+        })
+
+    def send_head(self):
+        """Serve regular files with strong ETags, 304s and Cache-Control
+
+        Files come from the server's FileCache when enabled, otherwise they
+        stream from disk. Directories and errors keep the stock behaviour.
+        """
+        path = self.translate_path(self.path)
+        if path.endswith('/'):
+            path = os.path.join(path, 'index.html')
+        ctype = self.guess_type(path)
+
+        entry, hit = None, False
+        cache = getattr(self.server, 'file_cache', None)
+        if cache is not None:
+            try:
+                entry, hit = cache.get(path, ctype)
+            except OSError:
+                return super().send_head()
+
+        if entry is not None:
+            body = io.BytesIO(entry.data)
+            size, mtime = entry.size, entry.mtime
+        else:
+            try:
+                body = open(path, 'rb')
+            except OSError:
+                return super().send_head()
+            fs = os.fstat(body.fileno())
+            if not stat.S_ISREG(fs.st_mode):
+                body.close()
+                return super().send_head()
+            size, mtime = fs.st_size, fs.st_mtime
+
+        try:
+            index = getattr(self.server, 'metadata_index', None)
+            meta = None
+            if index is not None:
+                meta = index.get(path, size, mtime, entry.data if entry else None)
+
+            links = []
+            preloads = getattr(self.server, 'preload_index', None)
+            if preloads is not None and ctype == 'text/html':
+                links = preloads.get(path, size, mtime, entry.data if entry else None)
+
+            hub = getattr(self.server, 'live_reload', None)
+            if hub is not None and ctype == 'text/html':
+                html = entry.data if entry is not None else body.read()
+                body.close()
+                body = io.BytesIO(inject_live_reload(html))
+                size = len(body.getvalue())
+                if meta is not None:
+                    meta = meta._replace(etag=meta.etag[:-1] + '-livereload"')
+
+            if self.not_modified(meta, mtime):
+                self.send_response(http.server.HTTPStatus.NOT_MODIFIED)
+                self.send_validators(meta, mtime)
+                self.end_headers()
+                body.close()
+                return None
+
+            ranges = None
+            if "Range" in self.headers and self.if_range_matches(meta, mtime):
+                ranges = parse_range(self.headers["Range"], size)
+                if ranges == []:
+                    self.send_response(http.server.HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    body.close()
+                    return None
+
+            if links and getattr(self.server, 'early_hints', False):
+                self.send_early_hints(links)
+            if ranges:
+                self.send_response(http.server.HTTPStatus.PARTIAL_CONTENT)
+            else:
+                self.send_response(http.server.HTTPStatus.OK)
+            if links:
+                self.send_header("Link", ", ".join(links))
+            if ranges and len(ranges) == 1:
+                start, end = ranges[0]
+                self.send_header("Content-type", ctype)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.body_spans = [(b'', start, end - start + 1)]
+            elif ranges:
+                boundary = uuid.uuid4().hex
+                self.body_spans = multipart_spans(ranges, size, ctype, boundary)
+                length = sum(len(head) + count for head, _, count in self.body_spans)
+                self.send_header("Content-type", f"multipart/byteranges; boundary={boundary}")
+                self.send_header("Content-Length", str(length))
+            else:
+                self.send_header("Content-type", ctype)
+                self.send_header("Content-Length", str(size))
+                self.body_spans = [(b'', 0, size)]
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_validators(meta, mtime)
+            if cache is not None:
+                self.cache_status = "HIT" if hit else ("MISS" if entry else "BYPASS")
+                self.send_header("X-Cache", self.cache_status)
+            self.end_headers()
+            return body
+        except Exception:
+            body.close()
+            raise
+
+    def send_early_hints(self, links):
+        """Write a 103 Early Hints interim response ahead of the real one
+
+        1xx responses are only defined from HTTP/1.1 on, so the hints are
+        skipped unless both the request and the final response (this
+        handler's protocol_version) are HTTP/1.1 or later. Everyone else
+        just gets the Link header on the final response.
+        """
+        if min(http_version(self.request_version), http_version(self.protocol_version)) < (1, 1):
+            return
+        lines = [f"{self.protocol_version} 103 Early Hints"] + [f"Link: {link}" for link in links]
+        self.wfile.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+
+    def copyfile(self, source, outputfile):
+        """Write the spans planned by send_head
+
+        In-memory bodies are written from a memoryview; files on disk go
+        through os.sendfile where the platform has it, so their bytes never
+        pass through Python buffers.
+        """
+        spans = getattr(self, 'body_spans', None)
+        if spans is None:
+            return super().copyfile(source, outputfile)
+        data = source.getvalue() if isinstance(source, io.BytesIO) else None
+        for head, offset, count in spans:
+            if head:
+                outputfile.write(head)
+            if count == 0:
+                continue
+            if data is not None:
+                outputfile.write(memoryview(data)[offset:offset + count])
+            elif SENDFILE and outputfile is self.wfile:
+                self.sendfile(source, offset, count)
+            else:
+                source.seek(offset)
+                while count > 0:
+                    chunk = source.read(min(count, COPY_BUFSIZE))
+                    if not chunk:
+                        break
+                    outputfile.write(chunk)
+                    count -= len(chunk)
+
+    def sendfile(self, source, offset, count):
+        # socket.sendfile waits for a full send buffer to drain on sockets
+        # with a timeout (keep-alive), where a bare os.sendfile gets EAGAIN
+        sent = self.connection.sendfile(source, offset, count)
+        # The bytes bypass self.wfile, so count them for the metrics here
+        self.wfile.count += sent
+
+    def if_range_matches(self, meta, mtime):
+        """False when If-Range names a different representation (send it whole)"""
+        if_range = self.headers.get("If-Range")
+        if if_range is None:
+            return True
+        if_range = if_range.strip()
+        if if_range.startswith('"') or if_range.startswith('W/'):
+            # Only strong validators may be used with If-Range
+            return meta is not None and if_range == meta.etag
+        return if_range == self.date_time_string(mtime)
+
+    def send_validators(self, meta, mtime):
+        """ETag, Last-Modified and Cache-Control shared by 200 and 304 replies"""
+        if meta is not None:
+            self.send_header("ETag", meta.etag)
+        self.send_header("Last-Modified", self.date_time_string(mtime))
+        policy = getattr(self.server, 'cache_policy', None)
+        if any(name.lower() == 'cache-control' for name, _ in self.rule_headers):
+            policy = None   # the deploy config's own Cache-Control wins
+        if policy is not None:
+            cache_control = policy.lookup(urllib.parse.urlsplit(self.path).path)
+            if cache_control:
+                self.send_header("Cache-Control", cache_control)
+
+    def not_modified(self, meta, mtime):
+        """Evaluate If-None-Match, falling back to If-Modified-Since"""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            if meta is None:
+                return False
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            # Weak comparison is correct for GET/HEAD (RFC 9110 13.1.2)
+            return '*' in tags or any(tag.removeprefix('W/') == meta.etag for tag in tags)
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            ims = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if ims.tzinfo is None:
+            ims = ims.replace(tzinfo=datetime.timezone.utc)
+        last_modified = datetime.datetime.fromtimestamp(
+            mtime, datetime.timezone.utc).replace(microsecond=0)
+        return last_modified <= ims
+
+
+class SerialHTTPServer(socketserver.TCPServer):
+    """Single-threaded TCPServer that can rebind a port left in TIME_WAIT"""
+
+    allow_reuse_address = True
+
+
+class ThreadPoolHTTPServer(socketserver.TCPServer):
+    """TCPServer that hands accepted connections to a fixed pool of worker threads
+
+    Accepted sockets go through a bounded queue. When every worker is busy and
+    the queue is full, the accept loop blocks, so new clients wait in the
+    kernel listen backlog instead of piling up in memory.
+    """
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, server_address, handler_class, workers=WORKERS,
+                 queue_size=QUEUE_SIZE, bind_and_activate=True):
+        self.workers = workers
+        self.pending = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        super().__init__(server_address, handler_class, bind_and_activate)
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"http-worker-{i}",
+                                      daemon=self.daemon_threads)
+            thread.start()
+            self._threads.append(thread)
+
+    def process_request(self, request, client_address):
+        """Queue the connection for a worker (blocks when the queue is full)"""
+        self.pending.put((request, client_address))
+
+    def _worker(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        for _ in self._threads:
+            self.pending.put(None)
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+
+class AsyncioHTTPServer(socketserver.TCPServer):
+    """Event-loop accept path with a bounded asyncio queue
+
+    The loop owns the listening socket and the queue; a fixed number of
+    consumer tasks run the (blocking) request handler in a thread executor.
+    A full queue suspends the accept task, which applies backpressure the
+    same way the thread-pool backend does.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, workers=WORKERS,
+                 queue_size=QUEUE_SIZE, bind_and_activate=True):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._loop = None
+        self._stopped = None
+        super().__init__(server_address, handler_class, bind_and_activate)
+
+    def serve_forever(self, poll_interval=0.5):
+        asyncio.run(self._serve())
+
+    def shutdown(self):
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self.socket.setblocking(False)
+        pending = asyncio.Queue(maxsize=self.queue_size)
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="http-worker")
+
+        async def accept():
+            while True:
+                request, client_address = await self._loop.sock_accept(self.socket)
+                request.setblocking(True)
+                await pending.put((request, client_address))
+
+        async def consume():
+            while True:
+                request, client_address = await pending.get()
+                await self._loop.run_in_executor(
+                    executor, self._handle, request, client_address)
+
+        tasks = [asyncio.create_task(accept())]
+        tasks += [asyncio.create_task(consume()) for _ in range(self.workers)]
+        try:
+            await self._stopped.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            while not pending.empty():
+                request, _ = pending.get_nowait()
+                self.shutdown_request(request)
+            executor.shutdown(wait=True)
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+def make_server(backend='threads', port=PORT, workers=WORKERS, queue_size=QUEUE_SIZE,
+                cache_size=CACHE_SIZE, cache_policy=None, metadata_index=None,
+                access_log=True, watch='auto', live_reload=False, platform_rules=None,
+                preload=True, early_hints=False, listen_socket=None,
+                handler_class=MyHTTPRequestHandler):
+    """Build a server for the requested concurrency backend
+
+    cache_size is the FileCache byte budget; 0 disables the cache.
+    cache_policy defaults to CachePolicy(CACHE_POLICY) and metadata_index
+    to a fresh (unscanned) MetadataIndex. access_log is a writable stream,
+    True for stderr or False to keep the stock log lines. watch picks the
+    file watcher that invalidates cached entries ('off' disables it), and
+    live_reload adds the SSE endpoint and HTML snippet on top of it.
+    platform_rules is a PlatformRules table to emulate (None serves files
+    as-is). preload adds Link: rel=preload headers to HTML responses and
+    early_hints also sends them in a 103 interim response, which makes
+    MyHTTPRequestHandler answer in HTTP/1.1. listen_socket is an already
+    listening socket to serve instead of binding port, which is how
+    pre-forked workers take over the supervisor's sockets.
+    """
+    if backend == 'serial':
+        httpd = SerialHTTPServer(("", port), handler_class, bind_and_activate=False)
+    elif backend == 'threads':
+        httpd = ThreadPoolHTTPServer(("", port), handler_class, workers=workers,
+                                     queue_size=queue_size, bind_and_activate=False)
+    elif backend == 'asyncio':
+        httpd = AsyncioHTTPServer(("", port), handler_class, workers=workers,
+                                  queue_size=queue_size, bind_and_activate=False)
+    else:
+        raise ValueError(f"Unknown backend: {backend}")
+
+    if listen_socket is not None:
+        httpd.socket.close()
+        httpd.socket = listen_socket
+        httpd.server_address = listen_socket.getsockname()
+    else:
+        try:
+            httpd.server_bind()
+            httpd.server_activate()
+        except Exception:
+            httpd.server_close()
+            raise
+
+    httpd.file_cache = FileCache(cache_size) if cache_size > 0 else None
+    httpd.metadata_index = metadata_index if metadata_index is not None else MetadataIndex(DIRECTORY)
+    httpd.cache_policy = cache_policy if cache_policy is not None else CachePolicy()
+    httpd.metrics = Metrics()
+    httpd.platform_rules = platform_rules
+    httpd.preload_index = PreloadIndex(DIRECTORY) if preload else None
+    httpd.early_hints = preload and early_hints
+    if access_log:
+        httpd.access_log = AccessLog(None if access_log is True else access_log)
+    else:
+        httpd.access_log = None
+
+    httpd.live_reload = LiveReloadHub() if live_reload else None
+    httpd.watcher = None
+    if watch != 'off':
+        httpd.watcher = make_watcher(watch, DIRECTORY, functools.partial(on_files_changed, httpd))
+        if isinstance(httpd.watcher, InotifyWatcher) and httpd.file_cache is not None:
+            # Every change is reported, so cached entries never need a re-stat
+            httpd.file_cache.revalidate = float('inf')
+        httpd.watcher.start()
+    return httpd
+
+
+def on_files_changed(httpd, paths):
+    """Watcher callback: drop stale cache/index entries and notify browsers"""
+    if httpd.preload_index is not None:
+        # Any file appearing or vanishing can change which preloads are valid
+        httpd.preload_index.clear()
+    if paths is None:
+        if httpd.file_cache is not None:
+            httpd.file_cache.clear()
+        httpd.metadata_index.clear()
+        if httpd.live_reload is not None:
+            httpd.live_reload.broadcast('*')
+        return
+    for path in sorted(paths):
+        if httpd.file_cache is not None:
+            httpd.file_cache.invalidate(path)
+        httpd.metadata_index.invalidate(path)
+        if httpd.live_reload is not None:
+            url_path = '/' + os.path.relpath(path, DIRECTORY).replace(os.sep, '/')
+            httpd.live_reload.broadcast(url_path)
+
+
+def close_server(httpd):
+    """Close the listening socket, stop watching and flush the access log"""
+    httpd.server_close()
+    if httpd.watcher is not None:
+        httpd.watcher.stop()
+    if httpd.live_reload is not None:
+        httpd.live_reload.close()
+    if httpd.access_log is not None:
+        httpd.access_log.close()
+
+
+class PreforkSupervisor:
+    """Run N server processes on one port and keep them alive
+
+    The supervisor binds and listens before any worker starts. With
+    SO_REUSEPORT every worker slot gets its own socket on the port, so the
+    kernel balances connections across workers and wakes one process per
+    connection; without it all workers accept from one shared socket. The
+    supervisor keeps the sockets open, so connections queue in the kernel
+    backlog from the first moment (and across worker restarts) instead of
+    being refused. The supervisor restarts workers
+    that exit unexpectedly, backing off when a worker keeps dying right
+    after start, and on Ctrl+C or SIGTERM asks every worker to finish
+    in-flight requests before exiting.
+    """
+
+    def __init__(self, server_factory, processes, port):
+        self.server_factory = server_factory
+        self.processes = processes
+        self.port = port
+        self.workers = {}       # pid -> slot
+        self.started = {}       # slot -> start time
+        self.failures = collections.Counter()
+        self.restarts = {}      # slot -> time it is due to be respawned
+        self.sockets = []
+
+    def listen(self):
+        """Bind and listen on the worker sockets; returns the port"""
+        port = self.port
+        try:
+            for _ in range(self.processes if REUSEPORT else 1):
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.sockets.append(sock)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                if REUSEPORT:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                sock.bind(("", port))
+                sock.listen(PREFORK_BACKLOG)
+                # Port 0 picks a free port once; the other sockets join it
+                port = sock.getsockname()[1]
+        except OSError:
+            self.close()
+            raise
+        if not REUSEPORT:
+            # Workers race to accept; the losers must get EAGAIN, not block
+            self.sockets[0].setblocking(False)
+        self.port = port
+        return port
+
+    def close(self):
+        for sock in self.sockets:
+            sock.close()
+        self.sockets = []
+
+    def spawn(self, slot):
+        pid = os.fork()
+        if pid == 0:
+            os._exit(self.run_worker(slot))
+        self.workers[pid] = slot
+        self.started[slot] = time.monotonic()
+        return pid
+
+    def run_worker(self, slot):
+        """Child process body; returns the exit status"""
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        listen_socket = self.sockets[slot % len(self.sockets)]
+        for sock in self.sockets:
+            if sock is not listen_socket:
+                sock.close()
+        try:
+            httpd = self.server_factory(port=self.port, listen_socket=listen_socket)
+        except Exception:
+            traceback.print_exc()
+            return 1
+        # shutdown() blocks until serve_forever returns, so call it off-thread
+        signal.signal(signal.SIGTERM,
+                      lambda signum, frame: threading.Thread(target=httpd.shutdown).start())
+        try:
+            httpd.serve_forever()
+        except Exception:
+            traceback.print_exc()
+            return 1
+        finally:
+            close_server(httpd)
+        return 0
+
+    def run(self):
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+        for slot in range(self.processes):
+            self.spawn(slot)
+        try:
+            while self.workers or self.restarts:
+                now = time.monotonic()
+                for slot, due in list(self.restarts.items()):
+                    if due <= now:
+                        del self.restarts[slot]
+                        self.spawn(slot)
+                if not self.restarts:
+                    self.reap(*os.wait())
+                    continue
+                # A restart is pending: poll so other exits are still reaped
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    pid = 0
+                if pid:
+                    self.reap(pid, status)
+                else:
+                    time.sleep(min(PREFORK_POLL, max(0.0, min(self.restarts.values()) - now)))
+        except KeyboardInterrupt:
+            self.stop()
+        finally:
+            self.close()
+
+    def reap(self, pid, status):
+        """Schedule the exited worker's slot for a restart"""
+        slot = self.workers.pop(pid, None)
+        if slot is None:
+            return
+        code = os.waitstatus_to_exitcode(status)
+        print(f"💥 Worker {pid} exited with status {code}, restarting")
+        now = time.monotonic()
+        if now - self.started[slot] < PREFORK_MIN_UPTIME:
+            self.failures[slot] += 1
+            self.restarts[slot] = now + min(2 ** self.failures[slot], PREFORK_MAX_BACKOFF)
+        else:
+            self.failures[slot] = 0
+            self.restarts[slot] = now
+
+    def stop(self):
+        print(f"\n👋 Stopping {len(self.workers)} workers")
+        self.restarts.clear()
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.workers.pop(pid)
+        deadline = time.monotonic() + PREFORK_GRACE
+        while self.workers and time.monotonic() < deadline:
+            for pid in list(self.workers):
+                done, _ = os.waitpid(pid, os.WNOHANG)
+                if done:
+                    self.workers.pop(pid)
+            time.sleep(0.05)
+        for pid in self.workers:
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self.workers.clear()
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the portfolio locally")
+    parser.add_argument('--port', type=int, default=PORT,
+                        help="port to listen on (0 picks a free port)")
+    parser.add_argument('--backend', choices=BACKENDS, default='threads',
+                        help="concurrency backend")
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help="number of request handler workers")
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE,
+                        help="accepted connections waiting for a worker before accept blocks")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="pre-fork this many server processes, each with its own "
+                             "SO_REUSEPORT listener (one shared socket where unsupported)")
+    parser.add_argument('--cache-mb', type=float, default=CACHE_SIZE / (1024 * 1024),
+                        help="in-memory file cache size in MiB (0 disables it)")
+    parser.add_argument('--cache-policy', metavar='JSON',
+                        help="Cache-Control rules file: "
+                             '[{"pattern": "<regex>", "cache_control": "<value>"}, ...]')
+    parser.add_argument('--access-log', metavar='FILE', default='-',
+                        help="JSON-lines access log destination ('-' for stderr)")
+    parser.add_argument('--no-access-log', action='store_true',
+                        help="disable the access log")
+    parser.add_argument('--watch', choices=WATCH_MODES, default='auto',
+                        help="file watcher that invalidates cached files (auto prefers inotify)")
+    parser.add_argument('--live-reload', action='store_true',
+                        help=f"push changes over SSE at {LIVE_RELOAD_PATH} and hot-swap CSS/images")
+    parser.add_argument('--emulate', choices=PLATFORMS, default='netlify',
+                        help="apply headers and rewrites from netlify.toml or render.yaml")
+    parser.add_argument('--no-preload', action='store_true',
+                        help="don't add Link: rel=preload headers to HTML responses")
+    parser.add_argument('--early-hints', action='store_true',
+                        help="also send preloads as a 103 Early Hints response "
+                             "(serves HTTP/1.1 with keep-alive)")
+    parser.add_argument('--no-browser', action='store_true',
+                        help="don't open the site in a browser")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.workers < 1:
+        raise SystemExit("--workers must be at least 1")
+    if args.live_reload and args.watch == 'off':
+        raise SystemExit("--live-reload needs a file watcher (drop --watch off)")
+    if args.processes > 1 and not hasattr(os, 'fork'):
+        raise SystemExit("--processes needs fork() (Linux/macOS)")
+
+    access_log = True
+    if args.no_access_log:
+        access_log = False
+    elif args.access_log != '-':
+        # Line-buffered append so pre-forked workers interleave whole records
+        access_log = open(args.access_log, 'a', buffering=1)
+
+    platform_rules = None
+    if args.emulate != 'off':
+        try:
+            platform_rules = load_platform_rules(args.emulate)
+        except (OSError, RuntimeError, KeyError, ValueError) as e:
+            print(f"⚠️  Not emulating {args.emulate}: {e}")
+
+    # Hash the tree once; pre-forked workers inherit the index
+    index = MetadataIndex(DIRECTORY)
+    indexed = index.scan()
+    server_factory = functools.partial(
+        make_server,
+        backend=args.backend,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        cache_size=int(args.cache_mb * 1024 * 1024),
+        cache_policy=CachePolicy.from_file(args.cache_policy) if args.cache_policy else None,
+        metadata_index=index,
+        access_log=access_log,
+        watch=args.watch,
+        live_reload=args.live_reload,
+        platform_rules=platform_rules,
+        preload=not args.no_preload,
+        early_hints=args.early_hints,
+    )
+
+    if args.processes > 1:
+        supervisor = PreforkSupervisor(server_factory, args.processes, args.port)
+        port = supervisor.listen()
+        httpd = None
+    else:
+        httpd = server_factory(port=args.port)
+        port = httpd.server_address[1]
+
+    print(f"🌐 Starting portfolio server on http://localhost:{port}")
+    print("📁 Serving files from:", DIRECTORY)
+    if args.backend != 'serial':
+        print(f"⚙️  Backend: {args.backend} ({args.workers} workers, queue {args.queue_size})")
+    if args.processes > 1:
+        print(f"🧵 Pre-forking {args.processes} processes")
+    print(f"🔖 Indexed {indexed} files for ETags")
+    print(f"📈 Metrics at http://localhost:{port}{METRICS_PATH}")
+    if platform_rules is not None:
+        print(f"🧭 Emulating {platform_rules.describe()}")
+    if args.live_reload:
+        print(f"🔄 Live reload on ({args.watch} watcher)")
+    print("Press Ctrl+C to stop the server\n")
+
+    # Open in browser
+    if not args.no_browser:
+        webbrowser.open(f'http://localhost:{port}')
+
+    if httpd is None:
+        supervisor.run()
+        return
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        close_server(httpd)
+
+    if httpd.file_cache is not None:
+        stats = httpd.file_cache.stats()
+        print(f"🗄️  File cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_ratio']:.0%} hit ratio), {stats['entries']} files, "
+              f"{stats['bytes']} bytes")
 
-# Open in browser
-webbrowser.open(f'http://localhost:{PORT}')
 
-with socketserver.TCPServer(("", PORT), MyHTTPRequestHandler) as httpd:
-    httpd.serve_forever()
+if __name__ == "__main__":
+    main()